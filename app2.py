@@ -1,11 +1,20 @@
 from flask import Flask, render_template, jsonify, request
 from translation.translator2 import Translator
+from translation.marian_registry import get_marian_registry
+from translation.micro_batcher import TranslationBatcher
 from stt.whisper_transcriber import WhisperTranscriber
 from stt.audio_recorder import AudioRecorder
+from stt.confidence_gate import ConfidenceGate
+from stt.endpointer import FirstTextLatency
+from stt.stitch import stitch_overlap
+from stt.streaming_transcriber import StreamingTranscriber
+from stt.whisper_pool import WhisperWorkerPool
 from tts.synthesizer import KokoroSynthesizer
 from chatbot.voice_chatbot import VoiceChatbot
 from language_detection.detector import LanguageDetector
-from utils.config import Languages, AudioConfig
+from language_detection.language_fusion import LanguageDecider
+from utils.config import Languages, AudioConfig, WhisperConfig, TranslationConfig
+from utils.warmup import pipeline_warmup
 from mcp.mcp2 import ConversationContext, ContextAwareTranslator
 import signal
 import sys
@@ -14,7 +23,7 @@ import threading
 import queue
 import time
 import os
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from collections import deque
 import asyncio
 from contextlib import contextmanager
@@ -26,6 +35,14 @@ class OptimizedTrilingualTranslator:
         # Initialize configurations
         self.languages = Languages().languages
         self.audio_config = AudioConfig()
+        whisper_config = WhisperConfig()
+        # Fork the transcription workers before this process loads any model. Streaming
+        # ASR is stateful and decodes in-process, so it does not use the pool.
+        self.transcription_pool = (
+            WhisperWorkerPool(whisper_config.POOL_WORKERS, whisper_config.POOL_CPU_THREADS, whisper_config.PROFILE)
+            if whisper_config.POOL_WORKERS and not self.audio_config.STREAMING_ASR else None
+        )
+        self.confidence_gate = ConfidenceGate(whisper_config) if whisper_config.GATE_ENABLED else None
         self.tts_lock = threading.Lock()
 
         # Threading controls
@@ -35,8 +52,14 @@ class OptimizedTrilingualTranslator:
         
         # Core components - initialize all upfront
         self.audio_recorder = AudioRecorder(self.audio_config)
-        self.transcriber = WhisperTranscriber()
+        # With a worker pool the workers hold the Whisper models; none is loaded here
+        self.transcriber = None if self.transcription_pool else WhisperTranscriber()
+        self.streaming_transcriber = (StreamingTranscriber(self.transcriber, self.audio_config.RATE)
+                                      if self.audio_config.STREAMING_ASR else None)
         self.language_detector = LanguageDetector(self.languages)
+        self.language_decider = LanguageDecider(
+            self.languages, self.language_detector, whisper_config.FUSION_WHISPER_CONFIDENT,
+            whisper_config.FUSION_CACHE_SIZE, whisper_config.FUSION_CACHE_MAX_CHARS, whisper_config.FUSION_PRIOR_DECAY)
         
         # Use thread pool for better resource management
         self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="TranslatorPool")
@@ -47,6 +70,11 @@ class OptimizedTrilingualTranslator:
             lang_code: Translator(self.languages, lang_code)
             for lang_code in self.languages
         }
+        # Queued transcriptions of one language pair share a single generate call
+        translation_config = TranslationConfig()
+        self.translation_batcher = TranslationBatcher(
+            self._translate_batch, translation_config.BATCH_MAX_ITEMS, translation_config.BATCH_WINDOW_MS)
+        self.translation_timeout = translation_config.RESULT_TIMEOUT_S
         
         self.synthesizers = {
             lang_code: KokoroSynthesizer(
@@ -69,6 +97,7 @@ class OptimizedTrilingualTranslator:
         self.running = False
         self.source_lang = None
         self.last_transcription = None
+        self.partial_transcription = ""  # Unstable tail while streaming ASR is on
         self.last_translation = None
         
         # Adaptive processing parameters
@@ -88,6 +117,14 @@ class OptimizedTrilingualTranslator:
             'errors': 0,
             'avg_processing_time': 0.0
         }
+        self.first_text_latency = FirstTextLatency()
+        self.last_segment_text = (None, "")  # (utterance_id, text) for overlap stitching
+
+        # Warm every model in the background; /status reports ready when done
+        # Only the active target's Marian models are loaded up front; others load on first use
+        self.warmup = pipeline_warmup(self.transcriber, {self.target_lang: self.translators[self.target_lang]},
+                                      self.synthesizers)
+        self.warmup.start()
         
         # Thread references
         self.worker_threads = []
@@ -150,15 +187,19 @@ class OptimizedTrilingualTranslator:
             except Exception as e:
                 print(f"Warning: Error cleaning up synthesizer: {e}")
         
+        self.translation_batcher.close()
+
         # Clear references
         self.synthesizers.clear()
         self.translators.clear()
         
         # Shutdown thread pool
         self.executor.shutdown(wait=True)
+        if self.transcription_pool:
+            self.transcription_pool.close()
 
     def change_language(self, new_lang):
-        """Change target language - all components already initialized."""
+        """Change target language - Marian models for the new target load on first use."""
         if new_lang not in self.languages or new_lang == self.target_lang:
             return False
 
@@ -173,43 +214,87 @@ class OptimizedTrilingualTranslator:
             print(f"Audio worker error: {e}")
             self.stats['errors'] += 1
 
+    def _submit_transcription(self, audio_data):
+        """Start transcribing one segment, in the worker pool when there is one."""
+        if self.transcription_pool:
+            try:
+                return self.transcription_pool.submit(audio_data)
+            except RuntimeError as e:
+                future = Future()  # Pool gave up; report it through the normal result path
+                future.set_exception(e)
+                return future
+        return self.executor.submit(self._process_transcription, audio_data)
+
+    def _handle_transcription(self, audio_data, result):
+        """Stitch, gate and forward the transcript of one segment."""
+        text, detected_lang = result[:2]
+        confidence = result[2] if len(result) > 2 else None
+        # Drop words repeated from the overlapping end of the previous segment
+        utterance_id = getattr(audio_data, "utterance_id", None)
+        if text and getattr(audio_data, "overlap_samples", 0) and self.last_segment_text[0] == utterance_id:
+            text = stitch_overlap(self.last_segment_text[1], text)
+        if text:
+            self.last_segment_text = (utterance_id, text)
+        # Junk and low-confidence text never reaches translation and TTS
+        if self.confidence_gate:
+            text = self.confidence_gate.filter(text, detected_lang, confidence, utterance_id,
+                                               getattr(audio_data, "final", True))
+        if text:
+            self.first_text_latency.record(audio_data)
+            detected_lang = self.language_decider.decide(
+                text, detected_lang, confidence.get("language_probs") if confidence else None)
+        if text and detected_lang in self.languages and detected_lang != self.target_lang:
+            self.source_lang = detected_lang
+            self.last_transcription = text
+            self._save_transcription_to_file(text)
+
+            self.transcription_queue.put((text, detected_lang, time.time()))
+            self.stats['transcriptions'] += 1
+
     def _transcription_worker(self):
         """Optimized transcription worker with better error handling."""
+        # With a worker pool several segments are in flight; results are still
+        # handed on oldest first. Streaming ASR is stateful and stays one at a time.
+        in_flight = deque()  # (audio_data, future, start_time)
+        if self.transcription_pool:
+            max_in_flight = 2 * len(self.transcription_pool.workers)
+        else:
+            max_in_flight = 1
+
         while self.running and not self.shutdown_event.is_set():
             try:
                 self.paused_event.wait(timeout=0.1)
                 if not self.paused_event.is_set():
                     continue
-                
-                audio_data = self.audio_queue.get(timeout=0.5)
-                start_time = time.time()
-                
-                # Submit transcription to thread pool for parallel processing
-                future = self.executor.submit(self._process_transcription, audio_data)
-                
+
                 try:
-                    result = future.result(timeout=5.0)  # 5 second timeout
-                    if result:
-                        text, detected_lang = result
-                        if text and detected_lang in self.languages and detected_lang != self.target_lang:
-                            self.source_lang = detected_lang
-                            self.last_transcription = text
-                            self._save_transcription_to_file(text)
-
-                            self.transcription_queue.put((text, detected_lang, time.time()))
-                            self.stats['transcriptions'] += 1
-                except Exception as e:
-                    print(f"Transcription processing error: {e}")
-                    self.stats['errors'] += 1
-                
-                # Update adaptive timing
-                processing_time = time.time() - start_time
-                self._update_adaptive_delay(processing_time)
-                
-                self.audio_queue.task_done()
-                
-            except queue.Empty:
-                continue
+                    audio_data = self.audio_queue.get(timeout=0.05 if in_flight else 0.5)
+                    if not audio_data and not self.streaming_transcriber:
+                        # End-of-utterance marker after partial segments
+                        self.audio_queue.task_done()
+                    else:
+                        in_flight.append((audio_data, self._submit_transcription(audio_data), time.time()))
+                except queue.Empty:
+                    pass
+
+                while in_flight and (in_flight[0][1].done() or len(in_flight) >= max_in_flight):
+                    audio_data, future, start_time = in_flight.popleft()
+                    try:
+                        # No timeout: a slow segment is still transcribed, and the pool
+                        # fails the future itself if its worker dies
+                        result = future.result()
+                        if result:
+                            self._handle_transcription(audio_data, result)
+                    except Exception as e:
+                        print(f"Transcription processing error: {e}")
+                        self.stats['errors'] += 1
+
+                    # Update adaptive timing
+                    processing_time = time.time() - start_time
+                    self._update_adaptive_delay(processing_time)
+
+                    self.audio_queue.task_done()
+
             except Exception as e:
                 print(f"Transcription worker error: {e}")
                 self.stats['errors'] += 1
@@ -217,26 +302,63 @@ class OptimizedTrilingualTranslator:
     def _process_transcription(self, audio_data):
         """Process transcription in thread pool."""
         try:
-            return self.transcriber.transcribe(audio_data)
+            if self.streaming_transcriber:
+                return self._process_streaming(audio_data)
+            return self.transcriber.transcribe(audio_data, with_confidence=True)
         except Exception as e:
             print(f"Transcription error: {e}")
             return None
 
+    def _process_streaming(self, audio_data):
+        """Feed the streaming transcriber; returns newly committed text, its language and confidence.
+
+        At the end of an utterance a result is returned even without new text,
+        so the confidence gate can expire text it is holding.
+        """
+        committed, language = [], None
+        for kind, text, lang in self.streaming_transcriber.process_segment(audio_data):
+            if kind == "partial":
+                self.partial_transcription = text
+            elif kind == "commit" and text:
+                committed.append(text)
+                language = lang
+        final = getattr(audio_data, "final", True)
+        if final:
+            self.partial_transcription = ""
+        if committed or final:
+            return " ".join(committed), language, self.streaming_transcriber.last_confidence
+        return None
+
     def _translation_worker(self):
-        """Stream-like translation: process each transcription as it arrives."""
+        """Stream-like translation: process each transcription as it arrives.
+
+        A backlog of queued transcriptions is submitted together so the
+        batcher can translate it in one call per language pair.
+        """
         while self.running and not self.shutdown_event.is_set():
             try:
-                # Wait for a transcription from the queue
+                # Wait for a transcription from the queue, then take any backlog
+                items = []
                 try:
-                    text, lang, timestamp = self.transcription_queue.get(timeout=0.1)
+                    items = [self.transcription_queue.get(timeout=0.1)]
                     self.transcription_queue.task_done()
+                    while True:
+                        items.append(self.transcription_queue.get_nowait())
+                        self.transcription_queue.task_done()
                 except queue.Empty:
-                    continue
-
-                if text.strip():
-                    # Translate immediately
-                    future = self.executor.submit(self._translate_text, text.strip(), lang)
-                    translation = future.result(timeout=3.0)
+                    if not items:
+                        continue
+
+                futures = [self.translation_batcher.submit(text.strip(), lang, self.target_lang)
+                           for text, lang, timestamp in items if text.strip()]
+                for future in futures:
+                    # One failed or slow translation must not drop the rest of the backlog
+                    try:
+                        translation = future.result(timeout=self.translation_timeout)
+                    except Exception as e:
+                        print(f"Translation error: {e}")
+                        self.stats['errors'] += 1
+                        continue
 
                     if translation and translation.strip() and translation.strip() != '...':
                         self.last_translation = translation
@@ -314,6 +436,19 @@ class OptimizedTrilingualTranslator:
             print(f"Translation error: {e}")
             return None
 
+    def _translate_batch(self, texts, source_lang, target_lang):
+        """Batched counterpart of _translate_text for the translation batcher.
+
+        translate_batch applies the same preprocessing, source-language
+        fallback and same-language passthrough as translate; a failure
+        yields None for every text, as _translate_text does for one.
+        """
+        try:
+            return self.translators[target_lang].translate_batch(texts, source_lang, target_lang)
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return [None] * len(texts)
+
     def _tts_worker(self):
         """Optimized TTS worker that actually processes the queue."""
         while self.running and not self.shutdown_event.is_set():
@@ -387,17 +522,44 @@ class OptimizedTrilingualTranslator:
         self.paused_event.set()
         return True
 
+    def _whisper_status(self):
+        """Model load times, routes and sticky-language state, per worker when transcribing in the pool."""
+        if self.transcription_pool:
+            workers = [stats or {} for stats in self.transcription_pool.get_worker_stats()]
+            return {
+                'whisper_load_ms': [stats.get('load_ms') for stats in workers],
+                'whisper_routes': [stats.get('routes') for stats in workers],
+                'language_tracker': [stats.get('language_tracker') for stats in workers]
+            }
+        tracker = self.transcriber.language_tracker
+        return {
+            'whisper_load_ms': self.transcriber.load_times,
+            'whisper_routes': self.transcriber.get_route_stats(),
+            'language_tracker': tracker.get_stats() if tracker else None
+        }
+
     def get_status(self):
         """Get comprehensive status information."""
         return {
             'running': self.running,
+            'ready': self.warmup.ready.is_set(),
+            'warmup': self.warmup.get_stats(),
             'paused': not self.paused_event.is_set(),
             'source_lang': self.languages[self.source_lang]['name'] if self.source_lang else None,
             'target_lang': self.languages[self.target_lang]['name'],
             'transcription': self.last_transcription,
+            'partial_transcription': self.partial_transcription,
             'translation': self.last_translation,
             'stats': self.stats.copy(),
             'adaptive_delay': round(self.adaptive_delay, 2),
+            'capture': self.audio_recorder.audio_source.get_stats(),
+            'first_text_latency': self.first_text_latency.summary(),
+            **self._whisper_status(),
+            'confidence_gate': self.confidence_gate.get_stats() if self.confidence_gate else None,
+            'translation_batching': self.translation_batcher.get_stats(),
+            'marian_models': get_marian_registry().get_stats(),
+            'language_decision': self.language_decider.get_stats(),
+            'transcription_pool': self.transcription_pool.get_stats() if self.transcription_pool else None,
             'queue_sizes': {
                 'audio': self.audio_queue.qsize(),
                 'transcription': self.transcription_queue.qsize(),
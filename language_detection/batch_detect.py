@@ -0,0 +1,118 @@
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from language_detection.ngram_classifier import NgramLanguageClassifier, PROFILES_PATH
+
+_classifier = None  # One per worker process
+
+
+def _init_worker(languages, profiles_path):
+    global _classifier
+    _classifier = NgramLanguageClassifier(languages, profiles_path)
+
+
+def _classify_chunk(texts):
+    return _classifier.classify_batch(texts)
+
+
+def _chunks(lines, chunk_size):
+    lines = iter(lines)
+    while True:
+        chunk = [line.rstrip("\n") for line in islice(lines, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def detect_batch(lines, languages=("en", "es", "fr"), threshold=0.6, workers=0, chunk_size=2000,
+                 profiles_path=PROFILES_PATH):
+    """Yield (text, language, probability) for each line, in input order.
+
+    Stateless, unlike LanguageDetector.detect: a line scoring below threshold
+    gets language None rather than the previous line's language. Lines are
+    read lazily in chunks, and with workers > 0 at most 2 * workers chunks are
+    in flight, so memory stays constant however long the input is.
+    """
+    if not workers:
+        _init_worker(list(languages), profiles_path)
+        for chunk in _chunks(lines, chunk_size):
+            yield from _label(chunk, _classify_chunk(chunk), threshold)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(list(languages), profiles_path)) as pool:
+        in_flight = deque()  # (chunk, future)
+        for chunk in _chunks(lines, chunk_size):
+            in_flight.append((chunk, pool.submit(_classify_chunk, chunk)))
+            if len(in_flight) >= 2 * workers:
+                chunk, future = in_flight.popleft()
+                yield from _label(chunk, future.result(), threshold)
+        while in_flight:
+            chunk, future = in_flight.popleft()
+            yield from _label(chunk, future.result(), threshold)
+
+
+def _label(chunk, results, threshold):
+    for text, (language, probability) in zip(chunk, results):
+        yield text, language if probability >= threshold else None, probability
+
+
+def label_file(in_path, out_path, **kwargs):
+    """Write `language<TAB>probability<TAB>text` per input line as results arrive; returns counts per language."""
+    counts = {}
+    start = time.perf_counter()
+    with open(in_path, encoding="utf-8") as src, open(out_path, "w", encoding="utf-8") as out:
+        for text, language, probability in detect_batch(src, **kwargs):
+            out.write(f"{language or '-'}\t{probability:.3f}\t{text}\n")
+            counts[language] = counts.get(language, 0) + 1
+    lines = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    print(f"Labelled {lines} lines in {elapsed:.1f}s ({lines / elapsed if elapsed else 0:.0f} lines/s) -> {out_path}")
+    return counts
+
+
+def relabel_history(in_path, out_path=None, **kwargs):
+    """Re-detect source_lang of every exchange in a conversation history file.
+
+    History files are bounded by ConversationContext's max_history, so the
+    file is loaded whole. Exchanges that score below the threshold keep
+    their recorded language. Returns the number of exchanges changed.
+    """
+    with open(in_path, encoding="utf-8") as f:
+        data = json.load(f)
+    history = data.get("history", [])
+
+    changed = 0
+    labels = detect_batch((exchange["original"] for exchange in history), **kwargs)
+    for exchange, (_, language, _) in zip(history, labels):
+        if language and language != exchange["source_lang"]:
+            exchange["source_lang"] = language
+            changed += 1
+
+    with open(out_path or in_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Relabelled {changed} of {len(history)} exchanges -> {out_path or in_path}")
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline language labelling of transcripts and conversation history")
+    parser.add_argument("input", help="Transcript file (one utterance per line) or history JSON with --history")
+    parser.add_argument("-o", "--output", help="Output path (default: <input>.lang.tsv; history is rewritten in place)")
+    parser.add_argument("--history", action="store_true", help="Input is a conversation_history.json file")
+    parser.add_argument("--languages", default="en,es,fr")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = classify in-process)")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    options = {"languages": args.languages.split(","), "threshold": args.threshold,
+               "workers": args.workers, "chunk_size": args.chunk_size}
+    if args.history:
+        relabel_history(args.input, args.output, **options)
+    else:
+        counts = label_file(args.input, args.output or args.input + ".lang.tsv", **options)
+        print("  " + ", ".join(f"{language or 'unknown'}: {count}" for language, count in counts.items()))
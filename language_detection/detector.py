@@ -1,10 +1,17 @@
-from langdetect import detect, LangDetectException
 import re
 
+from language_detection.ngram_classifier import NgramLanguageClassifier
+
+try:
+    from langdetect import detect, detect_langs, LangDetectException
+    LANGDETECT_AVAILABLE = True
+except ImportError:
+    LANGDETECT_AVAILABLE = False
+
 class LanguageDetector:
     """Detects language of text and identifies complete sentences."""
     
-    def __init__(self, languages):
+    def __init__(self, languages, threshold=0.6, backend="ngram"):
         self.languages = languages
         self.last_detected_lang = "en"  # Default fallback
         self.lang_map = {
@@ -12,11 +19,21 @@ class LanguageDetector:
             "es": "es",
             "fr": "fr"
         }
+        # Closed-set classifier over the configured languages; langdetect is the old path
+        self.threshold = threshold
+        self.backend = "langdetect" if backend == "langdetect" and LANGDETECT_AVAILABLE else "ngram"
+        self.classifier = NgramLanguageClassifier(languages) if self.backend == "ngram" else None
     
     def detect(self, text):
         """Detect the language of the text, fallback to last valid detection."""
         if not text:
             return self.last_detected_lang
+
+        if self.classifier:
+            lang, probability = self.classifier.classify(text)
+            if lang and probability >= self.threshold:
+                self.last_detected_lang = lang
+            return self.last_detected_lang
         
         try:
             detected = detect(text)
@@ -28,6 +45,18 @@ class LanguageDetector:
         except LangDetectException:
             return self.last_detected_lang
     
+    def scores(self, text):
+        """Probability per supported language for text (empty when nothing can be scored)."""
+        if not text:
+            return {}
+        if self.classifier:
+            return self.classifier.scores(text)
+        try:
+            return {self.lang_map[guess.lang]: guess.prob for guess in detect_langs(text)
+                    if guess.lang in self.lang_map and self.lang_map[guess.lang] in self.languages}
+        except LangDetectException:
+            return {}
+
     def is_complete_sentence(self, text, source_lang=None):
         """Check if text forms a complete sentence."""
         text = text.strip().lower()
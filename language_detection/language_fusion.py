@@ -0,0 +1,93 @@
+import math
+from collections import OrderedDict
+
+
+class LanguageDecider:
+    """Source language from Whisper's language probabilities, the text detector and a session prior.
+
+    When Whisper is confident (or the language was forced) its answer is
+    used and the text detector never runs. Otherwise the three sources are
+    combined as a product of probabilities over the supported languages.
+    Text scores for short utterances ("ok", "merci", "sí claro") are kept in
+    a bounded LRU, since the same few phrases recur all session.
+    """
+
+    def __init__(self, languages, text_detector, confident=0.9, cache_size=256, cache_max_chars=40,
+                 prior_decay=0.8, min_prior=0.05):
+        self.languages = list(languages)
+        self.text_detector = text_detector
+        self.confident = confident
+        self.cache_size = cache_size
+        self.cache_max_chars = cache_max_chars
+        self.prior_decay = prior_decay
+        self.min_prior = min_prior
+
+        self.prior = {lang: 1.0 / len(self.languages) for lang in self.languages}
+        self.cache = OrderedDict()  # normalized text -> text detector scores
+        self.paths = {"whisper": 0, "text": 0, "cache": 0, "prior": 0}
+
+    def _text_scores(self, text):
+        key = " ".join(text.lower().split())
+        if len(key) <= self.cache_max_chars and key in self.cache:
+            self.cache.move_to_end(key)
+            self.paths["cache"] += 1
+            return self.cache[key]
+
+        self.paths["text"] += 1
+        scores = self.text_detector.scores(text)
+        if len(key) <= self.cache_max_chars:
+            self.cache[key] = scores
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return scores
+
+    def decide(self, text, whisper_language=None, whisper_probs=None):
+        """Return the source language for text.
+
+        whisper_probs is Whisper's {language: probability}; without it a
+        supported whisper_language (forced by the sticky tracker, or from a
+        streaming decode) is taken as certain.
+        """
+        if whisper_probs is None and whisper_language in self.prior:
+            whisper_probs = {whisper_language: 1.0}
+        whisper = {lang: whisper_probs.get(lang, 0.0) for lang in self.languages} if whisper_probs else {}
+
+        if whisper and max(whisper.values()) >= self.confident:
+            self.paths["whisper"] += 1
+            language = max(whisper, key=whisper.get)
+        else:
+            text_scores = self._text_scores(text) if text else {}
+            # No text evidence (no letters, nothing scored): leave the text term out entirely
+            text_scores = {lang: text_scores.get(lang, 0.0) for lang in self.languages} if text_scores else {}
+            if not any(text_scores.values()):
+                text_scores = {}
+            whisper_total = sum(whisper.values())
+            if not text_scores and not whisper_total:
+                # Nothing to go on: keep the session's language and leave the prior as it is,
+                # so it is not reinforced by its own decision
+                self.paths["prior"] += 1
+                return max(self.prior, key=self.prior.get)
+
+            combined = {}
+            for lang in self.languages:
+                score = math.log(max(self.prior[lang], self.min_prior))
+                if whisper_total:
+                    score += math.log(max(whisper[lang] / whisper_total, 1e-4))
+                if text_scores:
+                    score += math.log(max(text_scores[lang], 1e-4))
+                combined[lang] = score
+            language = max(combined, key=combined.get)
+
+        for lang in self.languages:
+            self.prior[lang] = self.prior_decay * self.prior[lang] + (1 - self.prior_decay) * (lang == language)
+        return language
+
+    def get_stats(self):
+        decisions = sum(self.paths.values())
+        return {
+            "decisions": decisions,
+            "paths": dict(self.paths),
+            "text_detector_skipped": round(1 - self.paths["text"] / decisions, 3) if decisions else 0.0,
+            "cache_entries": len(self.cache),
+            "prior": {lang: round(p, 3) for lang, p in self.prior.items()}
+        }
@@ -0,0 +1,78 @@
+class LanguageTracker:
+    """Session-level source language, so Whisper can skip language ID once it is stable.
+
+    After `stable_segments` confident detections of the same language, the
+    language is locked and passed to Whisper as a fixed `language=`. Detection
+    runs again when a locked decode looks poor (low average log-prob) or
+    every `recheck_every` segments.
+    """
+
+    def __init__(self, supported, stable_segments=3, min_probability=0.8, min_logprob=-0.8, recheck_every=10):
+        self.supported = set(supported)
+        self.stable_segments = stable_segments
+        self.min_probability = min_probability
+        self.min_logprob = min_logprob
+        self.recheck_every = recheck_every
+
+        self.locked = None       # Language currently passed to Whisper
+        self.candidate = None    # Language seen in the current run of detections
+        self.streak = 0
+        self.since_check = 0     # Locked segments since language ID last ran
+
+        self.segments = 0
+        self.detections = 0
+        self.rechecks = 0
+        self.switches = 0
+
+    def language_hint(self):
+        """Language to force for the next segment, or None to run language ID."""
+        if self.locked and self.since_check < self.recheck_every:
+            return self.locked
+        return None
+
+    def update(self, language, probability=None, avg_logprob=None, forced=False):
+        """Record the outcome of one decode."""
+        self.segments += 1
+        if forced:
+            self.since_check += 1
+            if avg_logprob is not None and avg_logprob < self.min_logprob:
+                self.since_check = self.recheck_every  # Poor fit: detect on the next segment
+            return
+
+        self.detections += 1
+        if self.locked:
+            self.rechecks += 1
+        confident = language in self.supported and (probability is None or probability >= self.min_probability)
+        if not confident:
+            return
+
+        if language == self.locked:
+            self.since_check = 0
+            return
+        if self.locked:
+            # Speaker switched: drop the lock until the new language is stable too
+            self.switches += 1
+            self.locked = None
+
+        if language == self.candidate:
+            self.streak += 1
+        else:
+            self.candidate, self.streak = language, 1
+        if self.streak >= self.stable_segments:
+            self.locked, self.since_check = language, 0
+
+    def reset(self):
+        self.locked = None
+        self.candidate = None
+        self.streak = 0
+        self.since_check = 0
+
+    def get_stats(self):
+        return {
+            "locked_language": self.locked,
+            "segments": self.segments,
+            "language_id_skipped": self.segments - self.detections,
+            "rechecks": self.rechecks,
+            "switches": self.switches,
+            "switch_rate": round(self.switches / self.segments, 3) if self.segments else 0.0
+        }
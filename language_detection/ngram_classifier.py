@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ngram_profiles.json")
+WORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "common_words")
+WORD_COVERAGE = 0.5  # Share of running text the common word lists cover, for their probabilities
+_NON_LETTERS_RE = re.compile(r"[^\w'¿¡]+|[\d_]+", flags=re.UNICODE)
+_MARKS_RE = re.compile(r"([¿¡])")  # Inverted marks only open Spanish questions and exclamations
+
+
+def extract_words(text):
+    """Lowercased words, with digits and punctuation other than apostrophes removed; ¿ and ¡ are kept as words."""
+    text = _NON_LETTERS_RE.sub(" ", text.lower())
+    return (_MARKS_RE.sub(r" \1 ", text) if "¿" in text or "¡" in text else text).split()
+
+
+def extract_ngrams(text, max_n=3):
+    """Character 1- to 3-grams of lowercased words, padded with spaces like langdetect."""
+    return _word_ngrams(extract_words(text), max_n)
+
+
+def _word_ngrams(words, max_n=3):
+    grams = []
+    for word in words:
+        if word in "¿¡":
+            continue
+        padded = f" {word} "
+        for n in range(1, max_n + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return [gram for gram in grams if gram.strip()]
+
+
+class NgramLanguageClassifier:
+    """Closed-set character n-gram language ID over precomputed profile tables.
+
+    Each profile row holds log P(feature | language); a text's features are
+    its character n-grams plus its whole words, which matter most for short
+    utterances where a few n-grams are shared by all three languages. A text
+    is scored by summing the rows of its features in one NumPy reduction and
+    turning the totals into posteriors over the configured languages only.
+    classify abstains (language None) below min_confidence.
+    """
+
+    def __init__(self, languages, profiles_path=PROFILES_PATH, min_confidence=0.5, word_weight=3.0):
+        with open(profiles_path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.languages = [lang for lang in data["languages"] if lang in languages]
+        if not self.languages:
+            raise ValueError(f"No n-gram profiles for {list(languages)} in {profiles_path}")
+        self.min_confidence = min_confidence
+        self.index = {gram: i for i, gram in enumerate(data["ngrams"])}
+        words = data.get("words", [])
+        self.word_index = {word: len(data["ngrams"]) + i for i, word in enumerate(words)}
+
+        # log P(feature | lang) per n-gram order, and for whole words. The profiles drop
+        # rare features, so a missing one gets half the smallest kept count of its kind, not zero.
+        table = np.empty((len(data["ngrams"]) + len(words) + 1, len(self.languages)), dtype=np.float32)
+        orders = np.array([len(gram) for gram in data["ngrams"]])
+        for j, lang in enumerate(self.languages):
+            counts = np.array(data["counts"][lang], dtype=np.float64)
+            totals = np.array(data["n_words"][lang], dtype=np.float64)[orders - 1]
+            for n in np.unique(orders):
+                in_order = orders == n
+                kept = counts[in_order][counts[in_order] > 0]
+                counts[in_order & (counts == 0)] = kept.min() / 2 if len(kept) else 0.5
+            table[:len(orders), j] = np.log(counts / totals)
+            if words:
+                word_counts = np.array(data["word_counts"][lang], dtype=np.float64)
+                word_counts[word_counts == 0] = word_counts[word_counts > 0].min() / 2
+                # A word stands for several of its n-grams' worth of evidence
+                table[len(orders):-1, j] = word_weight * np.log(word_counts / data["word_totals"][lang])
+        table[-1] = 0.0  # Row for features outside the vocabulary: no evidence either way
+        self.table = table
+        self.unknown = len(table) - 1
+
+    def _rows(self, text):
+        """Table rows of text's n-grams and whole words."""
+        words = extract_words(text)
+        rows = [self.index.get(gram, self.unknown) for gram in _word_ngrams(words)]
+        if rows:
+            rows.extend(self.word_index.get(word, self.unknown) for word in words)
+        return rows
+
+    def scores(self, text):
+        """Posterior probability per language as a dict (empty for text without letters)."""
+        rows = self._rows(text)
+        if not rows:
+            return {}
+        loglik = self.table[np.array(rows, dtype=np.int64)].sum(axis=0, dtype=np.float64)
+        # Scale by feature count so long texts do not become overconfident
+        logits = loglik / np.sqrt(len(rows))
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        return dict(zip(self.languages, probs.tolist()))
+
+    def classify(self, text):
+        """Return (language, probability); language is None below min_confidence or with nothing to score."""
+        scores = self.scores(text)
+        if not scores:
+            return None, 0.0
+        lang = max(scores, key=scores.get)
+        return (lang if scores[lang] >= self.min_confidence else None), scores[lang]
+
+    def classify_batch(self, texts):
+        """classify() for many texts with one gather and one segmented sum over all their features."""
+        rows_per_text = [self._rows(text) for text in texts]
+        lengths = np.array([len(rows) for rows in rows_per_text], dtype=np.int64)
+        results = [(None, 0.0)] * len(texts)
+        scored = np.flatnonzero(lengths)
+        if not len(scored):
+            return results
+
+        rows = np.fromiter((row for text_rows in rows_per_text for row in text_rows),
+                           dtype=np.int64, count=int(lengths.sum()))
+        starts = (np.cumsum(lengths) - lengths)[scored]
+        loglik = np.add.reduceat(self.table[rows].astype(np.float64), starts, axis=0)
+        logits = loglik / np.sqrt(lengths[scored])[:, None]
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        for i, j, p in zip(scored, best, probs[np.arange(len(best)), best]):
+            results[i] = (self.languages[j] if p >= self.min_confidence else None, float(p))
+        return results
+
+
+def _load_words(words_dir, lang):
+    """Word list for lang, most frequent first (one word per line, # comments)."""
+    with open(os.path.join(words_dir, f"{lang}.txt"), encoding="utf-8") as f:
+        words = [line.strip().lower() for line in f if line.strip() and not line.startswith("#")]
+    return list(dict.fromkeys(words))
+
+
+def build_profiles(langdetect_profiles_dir, languages, out_path=PROFILES_PATH, words_dir=WORDS_DIR):
+    """Write the compact table from langdetect's profile files and the common word lists.
+
+    Word probabilities follow Zipf's law over each list's ranks, scaled so a
+    list covers WORD_COVERAGE of running text.
+    """
+    counts, n_words, word_ranks = {}, {}, {}
+    for lang in languages:
+        with open(os.path.join(langdetect_profiles_dir, lang), encoding="utf-8") as f:
+            profile = json.load(f)
+        merged = Counter()
+        for gram, count in profile["freq"].items():
+            merged[gram.lower()] += count  # Input is lowercased before scoring
+        counts[lang] = merged
+        n_words[lang] = profile["n_words"]
+        word_ranks[lang] = {word: rank for rank, word in enumerate(_load_words(words_dir, lang), start=1)}
+
+    ngrams = sorted(set().union(*counts.values()), key=lambda gram: (len(gram), gram))
+    words = sorted(set().union(*word_ranks.values()))
+    data = {
+        "source": "langdetect 1.0.9 profiles (Apache-2.0), lowercased; common_words/ lists",
+        "languages": list(languages),
+        "n_words": n_words,
+        "ngrams": ngrams,
+        "counts": {lang: [counts[lang].get(gram, 0) for gram in ngrams] for lang in languages},
+        "words": words,
+        "word_counts": {lang: [1 / word_ranks[lang][word] if word in word_ranks[lang] else 0 for word in words]
+                        for lang in languages},
+        "word_totals": {lang: sum(1 / rank for rank in word_ranks[lang].values()) / WORD_COVERAGE
+                        for lang in languages}
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"Saved {len(ngrams)} n-grams and {len(words)} words for {', '.join(languages)} to {out_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or try the closed-set n-gram language classifier")
+    parser.add_argument("--build", metavar="PROFILES_DIR",
+                        help="langdetect profiles directory (e.g. site-packages/langdetect/profiles)")
+    parser.add_argument("--languages", default="en,es,fr")
+    parser.add_argument("text", nargs="*")
+    args = parser.parse_args()
+
+    if args.build:
+        build_profiles(args.build, args.languages.split(","))
+    if args.text:
+        classifier = NgramLanguageClassifier(args.languages.split(","))
+        print(classifier.scores(" ".join(args.text)))
@@ -6,12 +6,21 @@ import warnings
 import os
 
 from stt.audio_silero import AudioRecorder
+from stt.audio_source import create_audio_source
+from stt.confidence_gate import ConfidenceGate
+from stt.endpointer import FirstTextLatency
+from stt.stitch import stitch_overlap
+from stt.streaming_transcriber import StreamingTranscriber
 from stt.whisper_transcriber import WhisperTranscriber
 from language_detection.detector import LanguageDetector
+from language_detection.language_fusion import LanguageDecider
 from translation.translator2 import Translator
+from translation.marian_registry import get_marian_registry
 from tts.synthesizer import KokoroSynthesizer
-from utils.config import Languages, AudioConfig
+from utils.config import Languages, AudioConfig, WhisperConfig
+from utils.warmup import pipeline_warmup
 from mcp.mcp2 import ConversationContext, ContextAwareTranslator
+from mcp.whisper_prompt import WhisperPromptBuilder
 
 warnings.filterwarnings("ignore")
 os.environ["TRANSFORMERS_NO_ADVISORY_WARNINGS"] = "true"
@@ -20,12 +29,17 @@ warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 class TrilingualTranslator:
-    def __init__(self):
+    def __init__(self, target_lang=None, audio_source=None, streaming_asr=False, batch_size=None,
+                 profile=None):
         # Initialize language configuration
         language_config = Languages()
         self.languages = language_config.languages
 
-        self.target_lang = self.get_target_language()
+        # File, stdin and socket sources run headless: stdin may carry the audio itself
+        self.interactive = audio_source in (None, "mic") or audio_source.startswith("mic:")
+        if not target_lang and not self.interactive:
+            raise ValueError("A target language (--target) is required for non-microphone sources")
+        self.target_lang = target_lang or self.get_target_language()
         print(f"\nTranslation setup: Auto-detect → {self.languages[self.target_lang]['name']}")
 
         self.source_lang = None
@@ -34,11 +48,29 @@ class TrilingualTranslator:
         self.conversation_context.load_history(self.history_file)
 
         self.audio_config = AudioConfig()
-        self.audio_recorder = AudioRecorder(self.audio_config)
-        self.transcriber = WhisperTranscriber()
+        if streaming_asr:
+            self.audio_config.STREAMING_ASR = True
+        if batch_size:
+            self.audio_config.TRANSCRIBE_BATCH_SIZE = batch_size
+        self.audio_recorder = AudioRecorder(
+            self.audio_config,
+            create_audio_source(audio_source, self.audio_config, self.audio_config.INPUT_DEVICE_INDEX)
+        )
+        self.transcriber = WhisperTranscriber(profile=profile)
+        # Condition Whisper on the conversation's topics and recent transcript
+        self.prompt_builder = WhisperPromptBuilder(self.conversation_context,
+                                                   count_tokens=self.transcriber.count_tokens)
+        self.transcriber.prompt_source = self.prompt_builder.build
+        whisper_config = WhisperConfig()
+        self.confidence_gate = ConfidenceGate(whisper_config) if whisper_config.GATE_ENABLED else None
+        self.streaming_transcriber = (StreamingTranscriber(self.transcriber, self.audio_config.RATE)
+                                      if self.audio_config.STREAMING_ASR else None)
         self.language_detector = LanguageDetector(self.languages)
+        self.language_decider = LanguageDecider(
+            self.languages, self.language_detector, whisper_config.FUSION_WHISPER_CONFIDENT,
+            whisper_config.FUSION_CACHE_SIZE, whisper_config.FUSION_CACHE_MAX_CHARS, whisper_config.FUSION_PRIOR_DECAY)
 
-        # 🗂️ Preload translators and synthesizers
+        # 🗂️ Translators share lazily loaded Marian models; preload synthesizers
         self.translators = {
             lang: Translator(self.languages, lang) for lang in self.languages
         }
@@ -67,6 +99,16 @@ class TrilingualTranslator:
         self.last_save_time = time.time()
         self.save_interval = 300
         self.processing_delay = 2.0
+        self.first_text_latency = FirstTextLatency()
+        self.last_segment_text = (None, "")  # (utterance_id, text) for overlap stitching
+        # Only the active target's Marian models are loaded up front; others load on first use
+        self.warmup = pipeline_warmup(self.transcriber, {self.target_lang: self.translators[self.target_lang]},
+                                      self.synthesizers,
+                                      on_ready=self._announce_ready)
+
+    def _announce_ready(self):
+        """Warmup completion callback: every model has been through its cold call."""
+        print("\n🚀 Context-Aware Real-time Translator Ready! All models warm - first utterance runs at full speed")
 
     def update_target_language(self, new_lang):
         # Update the internal translator to target new language
@@ -117,22 +159,91 @@ class TrilingualTranslator:
     def audio_worker(self):
         self.audio_recorder.start(self.audio_queue, self.running)
 
+    def _forward_transcript(self, text, detected_lang, final, language_probs=None):
+        """Resolve the source language and hand text to the translation worker."""
+        detected_lang = self.language_decider.decide(text, detected_lang, language_probs)
+        if detected_lang and detected_lang in self.languages and detected_lang != self.target_lang:
+            if self.source_lang != detected_lang:
+                self.source_lang = detected_lang
+                print(f"\nDetected language: {self.languages[self.source_lang]['name']}")
+            print(f"\n🗣️  Detected speech ({self.languages[self.source_lang]['name']}): {text}")
+            self.transcription_queue.put((text, detected_lang, final))
+
+    def _streaming_transcription(self, audio_data):
+        """Commit stable words as they appear; show the unstable tail as a partial."""
+        utterance_id = getattr(audio_data, "utterance_id", None)
+        final = getattr(audio_data, "final", True)
+        for kind, text, detected_lang in self.streaming_transcriber.process_segment(audio_data):
+            if kind == "partial":
+                self.first_text_latency.record(audio_data)
+                print(f"\r… {text}", end="", flush=True)
+            elif kind == "commit" and text:
+                # Committed words pass the same confidence gate as whole segments
+                if self.confidence_gate:
+                    text = self.confidence_gate.filter(text, detected_lang, self.streaming_transcriber.last_confidence,
+                                                       utterance_id, final=False)
+                if text:
+                    self.first_text_latency.record(audio_data)
+                    self._forward_transcript(text, detected_lang, False)
+        if final:
+            if self.confidence_gate:
+                self.confidence_gate.filter(None, utterance_id=utterance_id, final=True)  # Expire held text
+            # Committed words were already forwarded; only mark the utterance end
+            self.transcription_queue.put(("", None, True))
+
+    def _handle_transcription(self, audio_data, text, detected_lang, confidence=None):
+        """Stitch, gate, time and forward the transcript of one queued segment."""
+        final = getattr(audio_data, "final", True)
+
+        # Drop words repeated from the overlapping end of the previous segment
+        utterance_id = getattr(audio_data, "utterance_id", None)
+        if text and getattr(audio_data, "overlap_samples", 0) and self.last_segment_text[0] == utterance_id:
+            text = stitch_overlap(self.last_segment_text[1], text)
+        if text:
+            self.last_segment_text = (utterance_id, text)
+
+        # Junk and low-confidence text never reaches translation and TTS
+        if self.confidence_gate:
+            text = self.confidence_gate.filter(text, detected_lang, confidence, utterance_id, final)
+
+        if text:
+            self.first_text_latency.record(audio_data)
+            self._forward_transcript(text, detected_lang, final,
+                                     confidence.get("language_probs") if confidence else None)
+        elif final:
+            self.transcription_queue.put(("", None, True))
+
+    def _next_batch(self, first):
+        """Take whatever else is already queued, up to the batch size."""
+        batch = [first]
+        while len(batch) < self.audio_config.TRANSCRIBE_BATCH_SIZE:
+            try:
+                batch.append(self.audio_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
     def transcription_worker(self):
         while self.running:
             try:
                 audio_data = self.audio_queue.get(timeout=0.5)
-                text, detected_lang = self.transcriber.transcribe(audio_data)
-
-                if text:
-                    if not detected_lang or detected_lang not in self.languages:
-                        detected_lang = self.language_detector.detect(text)
-                    if detected_lang and detected_lang in self.languages and detected_lang != self.target_lang:
-                        if self.source_lang != detected_lang:
-                            self.source_lang = detected_lang
-                            print(f"\nDetected language: {self.languages[self.source_lang]['name']}")
-                        print(f"\n🗣️  Detected speech ({self.languages[self.source_lang]['name']}): {text}")
-                        self.transcription_queue.put((text, detected_lang))
-                self.audio_queue.task_done()
+                if self.streaming_transcriber:
+                    self._streaming_transcription(audio_data)
+                    self.audio_queue.task_done()
+                    continue
+
+                batch = self._next_batch(audio_data)
+                # Empty end-of-utterance markers after partials need no decoding
+                speech = [segment for segment in batch if segment]
+                if len(speech) > 1:
+                    results = iter(self.transcriber.transcribe_batch(speech, with_confidence=True))
+                else:
+                    results = iter([self.transcriber.transcribe(segment, with_confidence=True) for segment in speech])
+
+                for audio_data in batch:
+                    text, detected_lang, confidence = next(results) if audio_data else (None, None, None)
+                    self._handle_transcription(audio_data, text, detected_lang, confidence)
+                    self.audio_queue.task_done()
             except queue.Empty:
                 continue
             except Exception as e:
@@ -141,8 +252,9 @@ class TrilingualTranslator:
     def translation_worker(self):
         while self.running:
             try:
+                utterance_done = False
                 try:
-                    text, source_lang = self.transcription_queue.get(timeout=0.2)
+                    text, source_lang, utterance_done = self.transcription_queue.get(timeout=0.2)
                     if source_lang == self.target_lang:
                         self.transcription_queue.task_done()
                         continue
@@ -154,6 +266,8 @@ class TrilingualTranslator:
                 current_time = time.time()
                 if self.sentence_buffer and (
                     self.translator.base_translator.is_complete_sentence(self.sentence_buffer) or
+                    # Speaker finished the utterance: no need to wait for the delay
+                    (utterance_done and len(self.sentence_buffer.split()) >= 3) or
                     (current_time - self.last_processed_time > self.processing_delay and len(self.sentence_buffer.split()) >= 3)
                 ):
                     if self.sentence_buffer not in self.recent_translations and self.source_lang:
@@ -182,12 +296,30 @@ class TrilingualTranslator:
         while self.running:
             try:
                 translation = self.translation_queue.get(timeout=0.5)
-                self.synthesizer.speak(translation)
-                self.translation_queue.task_done()
             except queue.Empty:
                 continue
+            try:
+                self.synthesizer.speak(translation)
             except Exception as e:
                 print(f"TTS error: {str(e)}")
+            finally:
+                self.translation_queue.task_done()
+
+    def _wait_until_done(self, audio_thread, timeout=120):
+        """Headless run: wait for the source to end, then for queued work to drain."""
+        audio_thread.join()
+        deadline = time.time() + timeout
+        for q in (self.audio_queue, self.transcription_queue):
+            while q.unfinished_tasks and time.time() < deadline:
+                time.sleep(0.1)
+        # Text still buffered is translated once the utterance or the delay ends it
+        buffer_deadline = min(deadline, time.time() + self.processing_delay + 1)
+        while self.sentence_buffer and time.time() < buffer_deadline:
+            time.sleep(0.1)
+        while self.translation_queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.1)
+        if time.time() >= deadline:
+            print(f"⚠️  Queued work did not finish within {timeout}s; stopping anyway")
 
     def show_conversation_stats(self):
         stats = self.conversation_context.get_conversation_stats()
@@ -206,6 +338,33 @@ class TrilingualTranslator:
         print("\nLanguage pairs used:")
         for pair, count in stats['language_pairs'].items():
             print(f"  {pair}: {count} times")
+        latency = self.first_text_latency.summary()
+        print(f"\nEnd of speech → first text: avg {latency['avg_ms']:.0f} ms, "
+              f"p95 {latency['p95_ms']:.0f} ms over {latency['count']} utterances")
+        if self.warmup.ready.is_set():
+            self.warmup.print_report()
+        else:
+            print("Warmup still running...")
+        for route, stats in self.transcriber.get_route_stats().items():
+            print(f"Whisper route {route}: {stats['segments']} segments, avg {stats['avg_ms']:.0f} ms, RTF {stats['rtf']}")
+        decode = self.transcriber.decode_stats
+        if self.confidence_gate:
+            gate = self.confidence_gate.get_stats()
+            print(f"Confidence gate: {gate['passed']} passed, {gate['dropped']} dropped {gate['drop_reasons']}, "
+                  f"{gate['held']} held ({gate['released']} released, {gate['expired']} expired), "
+                  f"{gate['saved_segments']} translations/TTS calls saved")
+        marian = get_marian_registry().get_stats()
+        print(f"Marian models loaded: {', '.join(marian['loaded']) or 'none'} ({marian['memory_mb']} MB of "
+              f"{marian['budget_mb']} MB budget, {marian['loads']} loads, {marian['evictions']} evictions)")
+        print(f"Whisper fallback re-decodes: {decode['fallbacks']} of {decode['segments']} segments")
+        decision = self.language_decider.get_stats()
+        print(f"Language decisions: {decision['paths']} (text detector skipped on "
+              f"{decision['text_detector_skipped'] * 100:.0f}%), session prior {decision['prior']}")
+        if self.transcriber.language_tracker:
+            tracker = self.transcriber.language_tracker.get_stats()
+            print(f"Sticky language: {tracker['locked_language'] or 'detecting'}, "
+                  f"language ID skipped on {tracker['language_id_skipped']}/{tracker['segments']} segments, "
+                  f"{tracker['switches']} switches (rate {tracker['switch_rate']})")
         print("=" * 60)
 
     def export_conversation(self):
@@ -215,8 +374,11 @@ class TrilingualTranslator:
 
     def start(self):
         try:
+            # First calls are slow (allocation, kernel selection, G2P); pay that in the background
+            self.warmup.start()
+            audio_thread = threading.Thread(target=self.audio_worker, daemon=True)
             threads = [
-                threading.Thread(target=self.audio_worker, daemon=True),
+                audio_thread,
                 threading.Thread(target=self.transcription_worker, daemon=True),
                 threading.Thread(target=self.translation_worker, daemon=True),
                 threading.Thread(target=self.tts_worker, daemon=True)
@@ -224,11 +386,17 @@ class TrilingualTranslator:
             for thread in threads:
                 thread.start()
 
-            print("\n🚀 Context-Aware Real-time Translator Ready! (MCP Enabled)")
+            # The console is usable right away; "Ready" is printed by the warmup callback
+            print("\n🔥 Context-Aware Real-time Translator started, warming up models... (MCP Enabled)")
             print(f"📍 Auto-detecting source language → {self.languages[self.target_lang]['name']}")
             print("📂 Conversation history loaded and will be saved automatically")
             print("🧠 MCP (Model Context Protocol) providing intelligent context")
             print("=" * 70)
+            if not self.interactive:
+                print("Headless run: console commands off, stopping when the audio source ends")
+                print("=" * 70)
+                self._wait_until_done(audio_thread)
+                return
             print("Commands: lang | stats | export | clear | save | help | Ctrl+C to exit")
             print("=" * 70)
 
@@ -257,6 +425,9 @@ class TrilingualTranslator:
                         print("\nCommands: lang | stats | export | clear | save | help | Ctrl+C to exit")
                     elif cmd:
                         print("Unknown command. Type 'help' for available commands.")
+                except EOFError:
+                    # No console (headless run): keep the workers going
+                    time.sleep(1.0)
                 except Exception as e:
                     print(f"Command error: {str(e)}")
         except KeyboardInterrupt:
@@ -273,7 +444,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Context-Aware Trilingual Real-time Translator with MCP")
     parser.add_argument("--target", "-t", help="Set target language directly (en/es/fr)", choices=['en', 'es', 'fr'])
     parser.add_argument("--history-size", "-hs", type=int, default=100)
+    parser.add_argument("--source", "-s", default="mic",
+                        help="Audio input: mic, mic:<device>, stdin, tcp://host:port or a WAV/FLAC file")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Show partial transcripts while speaking and commit stable words early")
+    parser.add_argument("--batch-size", type=int,
+                        help="Transcribe up to this many queued segments in one batched Whisper call")
+    parser.add_argument("--profile", "-p", choices=list(WhisperConfig().profiles),
+                        help="Whisper decoding profile (default: WhisperConfig.PROFILE)")
     args = parser.parse_args()
+    if not args.target and not (args.source == "mic" or args.source.startswith("mic:")):
+        parser.error("--target is required with --source stdin, tcp:// or a file (there is no console prompt)")
 
-    translator = TrilingualTranslator()
+    translator = TrilingualTranslator(target_lang=args.target, audio_source=args.source,
+                                      streaming_asr=args.streaming, batch_size=args.batch_size,
+                                      profile=args.profile)
     translator.start()
@@ -216,10 +216,12 @@ class ConversationContext:
         if not self.topics:
             return []
 
-        topic_counts = {topic: 0 for topic in self.topics}
-        for ex in self.history:
+        # Snapshots: other threads add exchanges and topics while this runs
+        topics = list(self.topics)
+        topic_counts = {topic: 0 for topic in topics}
+        for ex in list(self.history):
             tokens = ex.get('tokens', [])
-            for topic in self.topics:
+            for topic in topics:
                 if topic in tokens:
                     topic_counts[topic] += 1
 
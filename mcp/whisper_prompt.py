@@ -0,0 +1,63 @@
+class WhisperPromptBuilder:
+    """Builds Whisper's initial_prompt and hotwords from a ConversationContext.
+
+    Hotwords come from the top conversation topics and the prompt from the
+    most recent transcript in the speaker's language, both within a token
+    budget. Until the language is known there is no transcript prompt, since
+    text in another language pushes Whisper toward that language. The result is cached until the context changes, so consecutive
+    segments reuse it without rebuilding.
+    """
+
+    def __init__(self, context, token_budget=120, max_topics=5, count_tokens=None):
+        self.context = context
+        self.token_budget = token_budget
+        self.max_topics = max_topics
+        # Rough estimate for when no Whisper tokenizer is at hand
+        self.count_tokens = count_tokens or (lambda text: int(len(text.split()) * 1.5) + 1)
+        self._cache_key = None
+        self._cached = (None, None)
+        self.builds = 0
+        self.cache_hits = 0
+
+    def _key(self, language):
+        history = self.context.history
+        last = history[-1]['timestamp'] if history else None
+        return language, len(history), last, len(self.context.topics)
+
+    def _fit(self, text, budget):
+        """Keep the end of text (the most recent words) within budget tokens."""
+        words = text.split()
+        while words and self.count_tokens(" ".join(words)) > budget:
+            words = words[max(1, len(words) // 8):]  # Drop the oldest words in small steps
+        return " ".join(words)
+
+    def build(self, language=None):
+        """Return (initial_prompt, hotwords) for the next segment; either may be None."""
+        key = self._key(language)
+        if key == self._cache_key:
+            self.cache_hits += 1
+            return self._cached
+        self.builds += 1
+
+        topics = self.context.get_top_topics(self.max_topics)
+        hotwords = self._fit(" ".join(topics), self.token_budget // 4) or None
+        budget = self.token_budget - (self.count_tokens(hotwords) if hotwords else 0)
+
+        # Newest exchanges first, in the speaker's language only. The translation
+        # thread appends to history meanwhile, so work on a copy.
+        recent, used = [], 0
+        for exchange in reversed(list(self.context.history) if language else []):
+            if exchange.get('source_lang') != language:
+                continue
+            used += self.count_tokens(exchange['original'])
+            recent.append(exchange['original'])
+            if used >= budget:
+                break
+        prompt = self._fit(" ".join(reversed(recent)), budget) or None
+
+        self._cache_key = key
+        self._cached = (prompt, hotwords)
+        return self._cached
+
+    def get_stats(self):
+        return {"builds": self.builds, "cache_hits": self.cache_hits}
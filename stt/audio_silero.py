@@ -1,48 +1,64 @@
-import pyaudio
 import threading
 import time
 import queue
 import numpy as np
 import torch
-from collections import deque
+from stt.silero_stream import StreamingSileroVAD
+from stt.cascade_vad import CascadeVAD
+from stt.ring_buffer import RingBuffer
+from stt.endpointer import Endpointer
+from stt.frontend import AudioFrontEnd
+from stt.audio_source import create_audio_source
+from stt.vad_loader import load_silero_vad
 
 class AudioRecorder:
     """Records audio with Silero-VAD voice activity detection."""
 
-    def __init__(self, audio_config):
+    def __init__(self, audio_config, audio_source=None):
         self.config = audio_config
         
-        # Initialize Silero-VAD
+        # Initialize Silero-VAD from the vendored weights (no network needed)
         torch.set_num_threads(1)
-        self.model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
-                                         model='silero_vad',
-                                         force_reload=True)
-        (self.get_speech_timestamps, _, _, *_) = utils
+        self.model, self.get_speech_timestamps = load_silero_vad(self.config.VAD_BACKEND)
         
-        # Audio interface
-        self.audio_interface = pyaudio.PyAudio()
+        # Audio input (live microphone unless a file/pipe/socket source is given)
+        self.audio_source = audio_source or create_audio_source(
+            None, audio_config, device_index=audio_config.INPUT_DEVICE_INDEX)
         
         # State variables
         self.running = True
-        self.speech_buffer = []
-        self.speech_active = False
-        self.last_voice_time = time.time()
-        self.speech_start_time = None
+        self.speech_active = False  # Debounced VAD state
+        self.endpointer = None
+        self.frontend = AudioFrontEnd(audio_config) if audio_config.FRONTEND_ENABLED else None
         
         # Audio processing buffer (needs to be large enough for Silero-VAD analysis)
         self.analysis_window_size = int(1.5 * self.config.RATE)  # 1.5 second window
-        self.audio_buffer = deque(maxlen=self.analysis_window_size * 2)  # Double for overlap
+        self.audio_buffer = RingBuffer(self.analysis_window_size, dtype=np.float32)
         
         # Hysteresis counters for more stable detection
         self.speech_counter = 0
         self.NO_SPEECH_FRAMES_TO_SILENCE = 3  # ~1.5s of no speech
         self.SPEECH_FRAMES_TO_ACTIVATE = 2    # ~1s of speech
 
-    def _process_audio_window(self, audio_data):
-        """Process audio window with Silero-VAD."""
-        # Convert to numpy array and then to torch tensor
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-        audio_tensor = torch.from_numpy(audio_np)
+        # Streaming mode: every 512-sample frame is inferred exactly once
+        self.streaming = self.config.VAD_STREAMING
+        if not self.streaming and self.get_speech_timestamps is None:
+            raise RuntimeError("Window VAD mode needs the Silero utilities (pip install silero-vad)")
+        self.stream_vad = StreamingSileroVAD(
+            self.model,
+            sample_rate=self.config.RATE,
+            threshold=self.config.vad_threshold,
+            neg_threshold=self.config.VAD_NEG_THRESHOLD,
+            min_speech_ms=self.config.VAD_MIN_SPEECH_MS,
+            min_silence_ms=self.config.VAD_MIN_SILENCE_MS
+        )
+        # Optionally screen chunks with webrtcvad so Silero idles during silence
+        self.vad = CascadeVAD(self.stream_vad, self.config) if self.config.VAD_CASCADE else self.stream_vad
+
+    def _process_audio_window(self, audio_window):
+        """Process a float32 audio window view with Silero-VAD."""
+        # The ring-buffer view is read-only; torch needs its own (writable) copy
+        audio_tensor = torch.from_numpy(audio_window.copy())
         
         # Get speech timestamps
         speech_timestamps = self.get_speech_timestamps(
@@ -50,103 +66,73 @@ class AudioRecorder:
         
         return len(speech_timestamps) > 0
 
+    def _window_speech_state(self, samples):
+        """Re-scan the last 1.5s window; returns None until the window is full."""
+        self.audio_buffer.append(samples)
+
+        # Only process when we have enough data for analysis
+        if len(self.audio_buffer) < self.analysis_window_size:
+            return None
+
+        # Check the most recent window of audio using Silero-VAD
+        is_speech = self._process_audio_window(self.audio_buffer.latest())
+
+        # Update speech state with hysteresis
+        if is_speech:
+            self.speech_counter = min(self.speech_counter + 1, self.SPEECH_FRAMES_TO_ACTIVATE)
+        else:
+            self.speech_counter = max(self.speech_counter - 1, -self.NO_SPEECH_FRAMES_TO_SILENCE)
+
+        # Determine new state
+        new_state = self.speech_active
+        if self.speech_counter >= self.SPEECH_FRAMES_TO_ACTIVATE:
+            new_state = True
+        elif self.speech_counter <= -self.NO_SPEECH_FRAMES_TO_SILENCE:
+            new_state = False
+        return new_state
+
     def start(self, audio_queue, running_flag):
         """Start recording audio with Silero-VAD."""
         self.running = running_flag
 
-        stream = self.audio_interface.open(
-            format=self.config.FORMAT,
-            channels=self.config.CHANNELS,
-            rate=self.config.RATE,
-            input=True,
-            input_device_index=1, 
-            frames_per_buffer=self.config.CHUNK_SIZE
-        )
+        stream = self.audio_source.open()
 
         print("\nListening for speech (Silero-VAD)...")
 
-        silence_chunks = 0
-        SILENCE_THRESHOLD = 0.30
-        max_silence_chunks = int(SILENCE_THRESHOLD * 1000 / self.config.CHUNK_DURATION_MS)
-
-        # Pre-buffer to capture audio before speech
-        pre_buffer = deque(maxlen=int(500 / self.config.CHUNK_DURATION_MS))
+        # Segmentation (pre-roll, partial/final segments) happens in the endpointer
+        self.endpointer = Endpointer(self.config, audio_queue)
 
         while self.running:
             try:
-                chunk = stream.read(self.config.CHUNK_SIZE, exception_on_overflow=False)
-                
-                # Store in buffers
-                self.audio_buffer.extend(np.frombuffer(chunk, dtype=np.int16))
-                pre_buffer.append(chunk)
-                
-                # Only process when we have enough data for analysis
-                if len(self.audio_buffer) >= self.analysis_window_size:
-                    # Get the most recent window of audio
-                    analysis_window = np.array(self.audio_buffer)[-self.analysis_window_size:]
-                    analysis_data = analysis_window.tobytes()
-                    
-                    # Check for speech using Silero-VAD
-                    is_speech = self._process_audio_window(analysis_data)
-                    
-                    # Update speech state with hysteresis
-                    if is_speech:
-                        self.speech_counter = min(self.speech_counter + 1, self.SPEECH_FRAMES_TO_ACTIVATE)
-                    else:
-                        self.speech_counter = max(self.speech_counter - 1, -self.NO_SPEECH_FRAMES_TO_SILENCE)
-                    
-                    # Determine new state
-                    new_state = self.speech_active
-                    if self.speech_counter >= self.SPEECH_FRAMES_TO_ACTIVATE:
-                        new_state = True
-                    elif self.speech_counter <= -self.NO_SPEECH_FRAMES_TO_SILENCE:
-                        new_state = False
-                    
-                    # Handle state changes
-                    if new_state and not self.speech_active:
-                        # Speech started
-                        self.speech_active = True
-                        self.speech_start_time = time.time()
-                        self.last_voice_time = time.time()
-                        self.speech_buffer = list(pre_buffer)  # Include pre-buffered audio
-                        #print("\nSpeech detected!")
-                    
-                    elif not new_state and self.speech_active:
-                        # Speech ended
-                        if len(self.speech_buffer) >= self.config.MIN_AUDIO_CHUNKS:
-                            audio_data = b''.join(self.speech_buffer)
-                            audio_queue.put(audio_data)
-                            conversion_time = time.time() - self.speech_start_time
-                            #print(f"Audio segment processed in {conversion_time:.2f}s")
-                        
-                        self.speech_buffer = []
-                        self.speech_active = False
-                        self.speech_start_time = None
-                        #print("Silence detected")
-                    
-                    # If speech is active, keep adding to buffer
-                    if self.speech_active:
-                        self.speech_buffer.append(chunk)
-                        self.last_voice_time = time.time()
-                        
-                        # Check if we've reached maximum recording length
-                        if len(self.speech_buffer) >= self.config.MAX_AUDIO_CHUNKS:
-                            audio_data = b''.join(self.speech_buffer)
-                            audio_queue.put(audio_data)
-                            conversion_time = time.time() - self.speech_start_time
-                            #print(f"Max length reached, processed in {conversion_time:.2f}s")
-                            self.speech_buffer = []
-                            self.speech_active = False
-                            self.speech_start_time = None
+                chunk = stream.read(self.config.CHUNK_SIZE)
+                if not chunk:
+                    break  # Source exhausted (file, pipe or closed socket)
+
+                samples = np.frombuffer(chunk, dtype=np.int16)
+                if self.frontend:
+                    samples = self.frontend.process(samples)
+
+                if self.streaming:
+                    self.speech_active = self.vad.update(samples)
+                    # Frame-level silence drives early emits before the state drops
+                    is_pause = self.vad.last_prob < self.vad.neg_threshold
+                else:
+                    new_state = self._window_speech_state(samples)
+                    if new_state is not None:
+                        self.speech_active = new_state
+                    is_pause = None
+
+                self.endpointer.process(samples, self.speech_active, is_pause)
 
             except Exception as e:
                 print(f"Recording error: {str(e)}")
                 break
 
-        stream.stop_stream()
+        # Flush speech still in progress when a finite source ends
+        self.endpointer.flush()
+
         stream.close()
 
     def stop(self):
         """Stop audio recording."""
         self.running = False
-        self.audio_interface.terminate()
\ No newline at end of file
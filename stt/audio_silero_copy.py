@@ -1,21 +1,22 @@
-import pyaudio
 import asyncio
 import threading
+import numpy as np
 import torch
 from stt.vad import AudioStreamProcessor  # assuming you have this vad package
+from stt.audio_source import create_audio_source
+from stt.vad_loader import load_silero_vad
 
 class AudioRecorder:
     """Records audio using AudioStreamProcessor from silero-vad wrapper with callbacks."""
 
-    def __init__(self, audio_config, message_queue, loop):
+    def __init__(self, audio_config, message_queue, loop, audio_source=None):
         self.config = audio_config
         self.message_queue = message_queue
         self.loop = loop  # asyncio event loop
 
-        # Load VAD model and utils once
-        self.vad_model, self.vad_utils = torch.hub.load(
-            'snakers4/silero-vad', model='silero_vad', force_reload=False
-        )
+        # Load VAD model and utils once, from the vendored weights
+        self.vad_model, get_speech_timestamps = load_silero_vad(self.config.VAD_BACKEND)
+        self.vad_utils = [get_speech_timestamps]
 
         # Define callbacks
         def on_speech_start():
@@ -50,36 +51,31 @@ class AudioRecorder:
             },
         )
 
-        # PyAudio interface for audio capture
-        self.audio_interface = pyaudio.PyAudio()
+        # Audio input (live microphone unless a file/pipe/socket source is given)
+        self.audio_source = audio_source or create_audio_source(
+            None, audio_config, device_index=audio_config.INPUT_DEVICE_INDEX)
         self.stream = None
         self.running = False
 
     def start(self):
-        """Start the microphone stream and processing loop."""
+        """Start the audio source and processing loop."""
         self.running = True
-        self.stream = self.audio_interface.open(
-            format=self.config.FORMAT,
-            channels=self.config.CHANNELS,
-            rate=self.config.RATE,
-            input=True,
-            frames_per_buffer=self.config.CHUNK_SIZE,
-            input_device_index=1,  # adjust as needed
-        )
+        self.stream = self.audio_source.open()
 
         print("\nListening for speech (AudioStreamProcessor)...")
 
         while self.running:
             try:
-                audio_chunk = self.stream.read(self.config.CHUNK_SIZE, exception_on_overflow=False)
-                self.vad_processor.process_audio_chunk(audio_chunk)
+                audio_chunk = self.stream.read(self.config.CHUNK_SIZE)
+                if not audio_chunk:
+                    break  # Source exhausted (file, pipe or closed socket)
+                samples = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
+                self.vad_processor.process_audio(samples)
             except Exception as e:
                 print(f"Error reading audio stream: {e}")
                 break
 
-        self.stream.stop_stream()
         self.stream.close()
-        self.audio_interface.terminate()
 
     def stop(self):
         """Stop the audio processing."""
@@ -0,0 +1,286 @@
+import socket
+import sys
+import time
+import wave
+
+import numpy as np
+
+from stt.ring_buffer import SPSCRingBuffer
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+
+class AudioSource:
+    """Base class for 16-bit mono PCM inputs feeding the recorders.
+
+    read() returns exactly n_frames frames of int16 bytes, or b'' once the
+    source is exhausted.
+    """
+
+    def open(self):
+        """Prepare the source for reading."""
+        return self
+
+    def read(self, n_frames):
+        raise NotImplementedError
+
+    def close(self):
+        """Release the underlying device, file or connection."""
+
+    def get_stats(self):
+        """Capture health counters, if the source keeps any."""
+        return {}
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MicrophoneSource(AudioSource):
+    """Live capture from a PyAudio input device."""
+
+    def __init__(self, audio_config, device_index=None):
+        if not PYAUDIO_AVAILABLE:
+            raise RuntimeError("PyAudio is not installed; use a file, stdin or TCP source instead")
+        self.config = audio_config
+        self.device_index = device_index
+        self.audio_interface = None
+        self.stream = None
+
+    def open(self):
+        if self.audio_interface is None:
+            self.audio_interface = pyaudio.PyAudio()
+        self.stream = self.audio_interface.open(
+            format=self.config.FORMAT,
+            channels=self.config.CHANNELS,
+            rate=self.config.RATE,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.config.CHUNK_SIZE
+        )
+        return self
+
+    def read(self, n_frames):
+        return self.stream.read(n_frames, exception_on_overflow=False)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.audio_interface is not None:
+            self.audio_interface.terminate()
+            self.audio_interface = None
+
+
+class CallbackMicrophoneSource(MicrophoneSource):
+    """Non-blocking capture: the PortAudio callback only copies frames into a
+    preallocated SPSC buffer and read() drains it on the consumer thread, so
+    VAD or GC pauses no longer drop input as long as the buffer has room.
+    """
+
+    def __init__(self, audio_config, device_index=None, buffer_seconds=2.0):
+        super().__init__(audio_config, device_index)
+        self.buffer = SPSCRingBuffer(int(buffer_seconds * audio_config.RATE))
+        self.poll_interval = audio_config.CHUNK_DURATION_MS / 4000
+        self.overflows = 0       # Callbacks that lost frames (driver overflow or full buffer)
+        self.underruns = 0       # Input underflows reported by PortAudio
+        self.dropped_frames = 0  # Frames discarded because the consumer fell behind
+        self.consumer_waits = 0  # Reads that found the buffer empty
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        if status_flags & pyaudio.paInputOverflow:
+            self.overflows += 1
+        if status_flags & pyaudio.paInputUnderflow:
+            self.underruns += 1
+
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        written = self.buffer.write(samples)
+        if written < len(samples):
+            self.overflows += 1
+            self.dropped_frames += len(samples) - written
+        return (None, pyaudio.paContinue)
+
+    def open(self):
+        if self.audio_interface is None:
+            self.audio_interface = pyaudio.PyAudio()
+        self.stream = self.audio_interface.open(
+            format=self.config.FORMAT,
+            channels=self.config.CHANNELS,
+            rate=self.config.RATE,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.config.CHUNK_SIZE,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+        return self
+
+    def read(self, n_frames):
+        samples = self.buffer.read(n_frames)
+        if samples is None:
+            self.consumer_waits += 1
+        while samples is None:
+            if self.stream is None or not self.stream.is_active():
+                return b''
+            time.sleep(self.poll_interval)
+            samples = self.buffer.read(n_frames)
+        return samples.tobytes()
+
+    def close(self):
+        stats = self.get_stats()
+        if stats["overflows"] or stats["underruns"]:
+            print(f"Capture stats: {stats}")
+        super().close()
+
+    def get_stats(self):
+        return {
+            "overflows": self.overflows,
+            "underruns": self.underruns,
+            "dropped_frames": self.dropped_frames,
+            "consumer_waits": self.consumer_waits,
+            "buffered_frames": len(self.buffer)
+        }
+
+
+class FileSource(AudioSource):
+    """Reads a WAV (or FLAC, with soundfile installed) file.
+
+    By default chunks are returned as fast as they are requested; set
+    realtime=True to pace reads like a microphone (speed scales the pace).
+    """
+
+    def __init__(self, path, audio_config, realtime=False, speed=1.0):
+        self.path = path
+        self.config = audio_config
+        self.realtime = realtime
+        self.speed = speed
+        self.samples = None
+        self.position = 0
+        self._start_time = None
+
+    def _load(self):
+        """Decode the whole file to mono int16 at the configured rate."""
+        if self.path.lower().endswith(".wav"):
+            with wave.open(self.path, "rb") as wf:
+                if wf.getsampwidth() != 2:
+                    raise ValueError(f"{self.path}: only 16-bit WAV files are supported")
+                rate = wf.getframerate()
+                channels = wf.getnchannels()
+                audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+                audio = audio.reshape(-1, channels).astype(np.float32) / 32768.0
+        else:
+            if not SOUNDFILE_AVAILABLE:
+                raise RuntimeError(f"soundfile is required to read {self.path}")
+            audio, rate = soundfile.read(self.path, dtype="float32", always_2d=True)
+
+        audio = audio.mean(axis=1)
+        if rate != self.config.RATE:
+            # Linear resampling is enough for VAD and Whisper input
+            n_out = int(len(audio) * self.config.RATE / rate)
+            audio = np.interp(np.linspace(0, len(audio) - 1, n_out), np.arange(len(audio)), audio)
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+    def open(self):
+        if self.samples is None:
+            self.samples = self._load()
+        self.position = 0
+        self._start_time = time.monotonic()
+        return self
+
+    def read(self, n_frames):
+        if self.position >= len(self.samples):
+            return b''
+
+        chunk = self.samples[self.position:self.position + n_frames]
+        self.position += n_frames
+        if len(chunk) < n_frames:
+            chunk = np.pad(chunk, (0, n_frames - len(chunk)))
+
+        if self.realtime:
+            due = self._start_time + self.position / (self.config.RATE * self.speed)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return chunk.tobytes()
+
+
+class StreamPCMSource(AudioSource):
+    """Raw little-endian int16 mono PCM at the configured rate from a binary stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, n_frames):
+        n_bytes = n_frames * 2
+        data = b''
+        while len(data) < n_bytes:
+            part = self.stream.read(n_bytes - len(data))
+            if not part:
+                break
+            data += part
+
+        if not data:
+            return b''
+        # Pad a trailing partial chunk so every read has the same size
+        return data.ljust(n_bytes, b'\0')
+
+
+class StdinPCMSource(StreamPCMSource):
+    """Raw PCM piped into stdin, e.g. `ffmpeg -i call.mp3 -f s16le -ac 1 -ar 16000 - | python main.py`."""
+
+    def __init__(self):
+        super().__init__(sys.stdin.buffer)
+
+
+class TCPPCMSource(StreamPCMSource):
+    """Listens on host:port and reads raw PCM from the first client that connects."""
+
+    def __init__(self, host="0.0.0.0", port=5000):
+        super().__init__(None)
+        self.host = host
+        self.port = port
+        self.server = None
+        self.connection = None
+
+    def open(self):
+        self.server = socket.create_server((self.host, self.port))
+        print(f"Waiting for PCM audio on tcp://{self.host}:{self.port} ...")
+        self.connection, address = self.server.accept()
+        print(f"Audio client connected from {address[0]}:{address[1]}")
+        self.stream = self.connection.makefile("rb")
+        return self
+
+    def close(self):
+        for resource in (self.stream, self.connection, self.server):
+            if resource is not None:
+                resource.close()
+        self.stream = self.connection = self.server = None
+
+
+def create_audio_source(spec, audio_config, device_index=None):
+    """Build a source from a spec: mic, mic:<index>, stdin, tcp://host:port, or a file path."""
+    if spec is None or spec == "mic" or spec.startswith("mic:"):
+        if spec and spec.startswith("mic:"):
+            device_index = int(spec[4:])
+        if audio_config.CAPTURE_CALLBACK:
+            return CallbackMicrophoneSource(audio_config, device_index, audio_config.CAPTURE_BUFFER_SECONDS)
+        return MicrophoneSource(audio_config, device_index)
+    if spec in ("stdin", "-"):
+        return StdinPCMSource()
+    if spec.startswith("tcp://"):
+        host, _, port = spec[len("tcp://"):].rpartition(":")
+        return TCPPCMSource(host or "0.0.0.0", int(port))
+    return FileSource(spec, audio_config)
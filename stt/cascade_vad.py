@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+
+class CascadeVAD:
+    """Cheap-first VAD: webrtcvad (or an energy check) screens every 30 ms chunk
+    and the streaming Silero model only runs where the gate sees possible speech.
+
+    Silero keeps running while it is in speech and for a hangover after the
+    gate last fired, so onset and offset decisions stay Silero's.
+    """
+
+    def __init__(self, stream_vad, audio_config):
+        self.stream_vad = stream_vad
+        self.rate = audio_config.RATE
+        self.energy_threshold = audio_config.CASCADE_ENERGY_THRESHOLD
+        self.gate = webrtcvad.Vad(audio_config.VAD_AGGRESSIVENESS) if WEBRTCVAD_AVAILABLE else None
+        self.hangover_chunks = max(1, math.ceil(audio_config.CASCADE_HANGOVER_MS / audio_config.CHUNK_DURATION_MS))
+        self._since_gate = self.hangover_chunks
+
+        self.chunks_gated = 0
+        self.chunks_total = 0
+
+    @property
+    def last_prob(self):
+        return self.stream_vad.last_prob
+
+    @property
+    def neg_threshold(self):
+        return self.stream_vad.neg_threshold
+
+    def _gate_fires(self, samples):
+        """Near-free speech check on one chunk of int16 samples."""
+        rms = float(np.sqrt(np.mean(np.square(samples.astype(np.float32)))))
+        if rms < self.energy_threshold:
+            return False  # Too quiet to be speech whatever webrtcvad says
+        if self.gate is None:
+            return True
+        return self.gate.is_speech(samples.tobytes(), self.rate)
+
+    def update(self, samples):
+        """Return the current speech state, running Silero only when needed."""
+        self.chunks_total += 1
+        if self._gate_fires(samples):
+            self._since_gate = 0
+        else:
+            self._since_gate += 1
+
+        infer = self.stream_vad.is_speaking or self._since_gate < self.hangover_chunks
+        if not infer:
+            self.chunks_gated += 1
+        return self.stream_vad.update(samples, infer=infer)
+
+    def reset(self):
+        self.stream_vad.reset()
+        self._since_gate = self.hangover_chunks
+
+    def get_stats(self):
+        return {
+            "chunks_total": self.chunks_total,
+            "chunks_skipped": self.chunks_gated,
+            "silero_frames": self.stream_vad.frames_inferred
+        }
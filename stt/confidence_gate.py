@@ -0,0 +1,113 @@
+import re
+
+# Whole-utterance outputs Whisper is known to invent from silence or noise. They are
+# also real replies, so a match is only dropped when the decode looks like silence.
+HALLUCINATIONS = {
+    "en": [
+        r"you", r"thank you( (so|very) much)?( for watching)?", r"thanks( for watching)?",
+        r"(please )?(like and )?subscribe( to (my|the) channel)?", r"bye( bye)?",
+        r"subtitles by .*", r"transcription by .*"
+    ],
+    "es": [
+        r"gracias( por ver( el video)?)?", r"(muchas )?gracias", r"suscr[ií]bete( al canal)?",
+        r"subt[ií]tulos (realizados )?por .*", r"adi[oó]s"
+    ],
+    "fr": [
+        r"merci( (beaucoup|d'avoir regard[ée] cette vid[ée]o))?", r"abonnez-vous( [àa] la cha[iî]ne)?",
+        r"sous-titres? (r[ée]alis[ée]s )?par .*", r"au revoir"
+    ]
+}
+
+_HALLUCINATION_RES = {
+    lang: re.compile(r"\s*(?:" + "|".join(patterns) + r")\s*[.!?,]*\s*", re.IGNORECASE)
+    for lang, patterns in HALLUCINATIONS.items()
+}
+_ANY_HALLUCINATION_RE = re.compile(
+    r"\s*(?:" + "|".join(p for patterns in HALLUCINATIONS.values() for p in patterns) + r")\s*[.!?,]*\s*",
+    re.IGNORECASE)
+# The same one- to four-word phrase four or more times in a row
+_REPETITION_RE = re.compile(r"\b(\w+(?:\W+\w+){0,3})(?:\W+\1\b){3,}", re.IGNORECASE)
+
+
+class ConfidenceGate:
+    """Decides whether a transcript is worth translating and speaking.
+
+    Junk (known hallucination phrases decoded from silence, repetition
+    loops, silence decoded as text) is dropped. Low-confidence text is held: it goes out together with the
+    next confident segment of the same utterance, or is dropped if the
+    utterance ends first. Counters record how much translation and TTS
+    work was saved.
+    """
+
+    def __init__(self, whisper_config):
+        self.no_speech_threshold = whisper_config.GATE_NO_SPEECH_PROB
+        self.drop_logprob = whisper_config.GATE_DROP_LOGPROB
+        self.hold_logprob = whisper_config.GATE_HOLD_LOGPROB
+        self.max_compression = whisper_config.GATE_MAX_COMPRESSION
+
+        self.held = None  # (utterance_id, text)
+        self.stats = {"passed": 0, "dropped": 0, "held": 0, "released": 0, "expired": 0, "saved_chars": 0}
+        self.drop_reasons = {}
+
+    def classify(self, text, language=None, confidence=None):
+        """Return ("pass" | "hold" | "drop", reason)."""
+        pattern = _HALLUCINATION_RES.get(language, _ANY_HALLUCINATION_RE)
+        if confidence and pattern.fullmatch(text) and (
+                confidence["no_speech_prob"] > self.no_speech_threshold
+                or confidence["avg_logprob"] < self.drop_logprob):
+            return "drop", "hallucination"
+        loop = _REPETITION_RE.search(text)
+        if loop and len(loop.group(0)) * 2 >= len(text.strip()):
+            return "drop", "repetition"  # A loop, not just a stutter inside a sentence
+        if confidence:
+            if confidence["compression_ratio"] > self.max_compression:
+                return "drop", "compression"
+            if confidence["no_speech_prob"] > self.no_speech_threshold and confidence["avg_logprob"] < self.drop_logprob:
+                return "drop", "no_speech"
+            if confidence["avg_logprob"] < self.hold_logprob:
+                return "hold", "low_logprob"
+        return "pass", None
+
+    def _drop(self, text, reason):
+        self.stats["dropped"] += 1
+        self.stats["saved_chars"] += len(text)
+        self.drop_reasons[reason] = self.drop_reasons.get(reason, 0) + 1
+
+    def _expire_held(self):
+        if self.held:
+            self.stats["expired"] += 1
+            self.stats["saved_chars"] += len(self.held[1])
+            self.held = None
+
+    def filter(self, text, language=None, confidence=None, utterance_id=None, final=True):
+        """Return the text to pass downstream (held text included), or None."""
+        if self.held and self.held[0] != utterance_id:
+            self._expire_held()
+
+        forward = None
+        if text:
+            decision, reason = self.classify(text, language, confidence)
+            if decision == "drop":
+                self._drop(text, reason)
+            elif decision == "hold":
+                self.stats["held"] += 1
+                held_text = self.held[1] + " " + text if self.held else text
+                self.held = (utterance_id, held_text)
+            else:
+                self.stats["passed"] += 1
+                if self.held:
+                    self.stats["released"] += 1
+                    text = self.held[1] + " " + text
+                    self.held = None
+                forward = text
+
+        if final:
+            self._expire_held()
+        return forward
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        # Each dropped or expired segment is one translate + speak call that never ran
+        stats["saved_segments"] = stats["dropped"] + stats["expired"]
+        stats["drop_reasons"] = dict(self.drop_reasons)
+        return stats
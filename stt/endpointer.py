@@ -0,0 +1,201 @@
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from stt.ring_buffer import RingBuffer, SampleBuffer
+
+
+class AudioSegment(bytes):
+    """int16 PCM bytes for audio_queue, tagged as a partial or final segment.
+
+    Being a bytes subclass, it can be consumed exactly like the plain bytes
+    the recorders used to queue.
+    """
+
+    def __new__(cls, data, final=True, utterance_id=0, speech_end_time=None, overlap_samples=0):
+        segment = super().__new__(cls, data)
+        segment.final = final
+        segment.utterance_id = utterance_id
+        segment.speech_end_time = speech_end_time or time.time()
+        # Leading samples repeated from the previous segment of the utterance
+        segment.overlap_samples = overlap_samples
+        return segment
+
+
+class Endpointer:
+    """Turns per-chunk VAD decisions into utterance segments on an audio queue.
+
+    An utterance runs while speech_active is true. With early emit enabled,
+    the audio collected so far is pushed as a partial segment as soon as a
+    short pause is seen, so transcription can start while the speaker is
+    still talking; the rest follows as the final segment when speech ends.
+    """
+
+    def __init__(self, audio_config, audio_queue):
+        self.config = audio_config
+        self.audio_queue = audio_queue
+        chunk_ms = audio_config.CHUNK_DURATION_MS
+
+        self.early_emit = audio_config.ENDPOINT_EARLY_EMIT
+        self.partial_pause_chunks = max(1, math.ceil(audio_config.ENDPOINT_PARTIAL_PAUSE_MS / chunk_ms))
+        self.min_partial_samples = int(audio_config.ENDPOINT_MIN_PARTIAL_MS * audio_config.RATE / 1000)
+        self.min_speech_samples = audio_config.MIN_AUDIO_CHUNKS * audio_config.CHUNK_SIZE
+        self.max_speech_samples = audio_config.MAX_AUDIO_CHUNKS * audio_config.CHUNK_SIZE
+        # Streaming ASR wants audio at a fixed cadence, not only at pauses
+        self.stream_interval_samples = (int(audio_config.STREAMING_ASR_INTERVAL_MS * audio_config.RATE / 1000)
+                                        if audio_config.STREAMING_ASR else 0)
+
+        # Long speech is split at the quietest point near the limit, with overlap
+        self.overlap_samples = int(audio_config.SEGMENT_OVERLAP_MS * audio_config.RATE / 1000)
+        self.cut_search_samples = int(audio_config.SEGMENT_CUT_SEARCH_MS * audio_config.RATE / 1000)
+        self.energy_frame = audio_config.RATE // 100  # 10 ms
+        self.segment_overlap = 0  # Overlap carried into the segment being assembled
+
+        # Pre-roll (~500ms before speech) and segment assembly, preallocated once
+        self.pre_roll = RingBuffer(int(500 / chunk_ms) * audio_config.CHUNK_SIZE)
+        self.speech_buffer = SampleBuffer(
+            self.pre_roll.capacity + (audio_config.MAX_AUDIO_CHUNKS + 1) * audio_config.CHUNK_SIZE)
+
+        self.speech_active = False
+        self.speech_start_time = None
+        self.pause_chunks = 0
+        self.pause_start_time = None
+        self.utterance_id = 0
+        self.utterance_samples = 0  # Audio already emitted as partials
+        self.partials_emitted = 0
+
+    def _emit(self, final, end=None):
+        """Queue the segment buffer (up to end) and start a new one."""
+        end_time = self.pause_start_time or time.time()
+        audio = self.speech_buffer.view()[:end]
+        segment = AudioSegment(audio.tobytes(), final=final, utterance_id=self.utterance_id,
+                               speech_end_time=end_time, overlap_samples=self.segment_overlap)
+        self.audio_queue.put(segment)
+        self.utterance_samples += len(audio)
+        self.speech_buffer.clear()
+        self.segment_overlap = 0
+        if not final:
+            self.partials_emitted += 1
+
+    def _low_energy_cut(self):
+        """Index of the quietest 10 ms frame in the search region at the end of the buffer."""
+        audio = self.speech_buffer.view()
+        start = max(self.overlap_samples, len(audio) - self.cut_search_samples)
+        n_frames = (len(audio) - start) // self.energy_frame
+        if n_frames < 1:
+            return len(audio)
+
+        region = audio[start:start + n_frames * self.energy_frame].astype(np.float32)
+        energy = np.square(region.reshape(n_frames, self.energy_frame)).mean(axis=1)
+        quietest = int(np.argmin(energy))
+        return start + quietest * self.energy_frame + self.energy_frame // 2
+
+    def _split_long_speech(self):
+        """Emit up to a low-energy point and carry an overlap into the next segment."""
+        cut = self._low_energy_cut()
+        overlap_start = max(0, cut - self.overlap_samples)
+        carry = self.speech_buffer.view()[overlap_start:].copy()
+
+        self._emit(final=False, end=cut)
+        self.speech_buffer.append(carry)
+        self.segment_overlap = cut - overlap_start
+        # The overlap is emitted twice; only count it once
+        self.utterance_samples -= self.segment_overlap
+
+    def _end_utterance(self):
+        """Emit the final segment of the utterance, if there is anything to say."""
+        if self.utterance_samples:
+            # Partials already went out; a too-short tail only marks the end
+            if len(self.speech_buffer) < self.min_speech_samples:
+                self.speech_buffer.clear()
+            self._emit(final=True)
+        elif len(self.speech_buffer) >= self.min_speech_samples:
+            self._emit(final=True)
+        self.speech_buffer.clear()
+        self.segment_overlap = 0
+        self.speech_active = False
+        self.speech_start_time = None
+        self.pause_chunks = 0
+        self.pause_start_time = None
+        self.utterance_samples = 0
+
+    def process(self, samples, speech_active, is_pause=None):
+        """Feed one chunk of int16 samples with the VAD's speech state.
+
+        is_pause is the instantaneous (non-debounced) silence decision used
+        for early emits; it defaults to `not speech_active`.
+        """
+        self.pre_roll.append(samples)
+        if is_pause is None:
+            is_pause = not speech_active
+
+        if speech_active and not self.speech_active:
+            # Speech started: include the pre-buffered audio
+            self.speech_active = True
+            self.speech_start_time = time.time()
+            self.utterance_id += 1
+            self.speech_buffer.clear()
+            self.speech_buffer.append(self.pre_roll.latest())
+            return
+
+        if not self.speech_active:
+            return
+
+        if not speech_active:
+            self._end_utterance()
+            return
+
+        self.speech_buffer.append(samples)
+
+        # Track short pauses inside the utterance
+        if is_pause:
+            if self.pause_chunks == 0:
+                self.pause_start_time = time.time()
+            self.pause_chunks += 1
+        else:
+            self.pause_chunks = 0
+            self.pause_start_time = None
+
+        if (self.early_emit and self.pause_chunks == self.partial_pause_chunks
+                and len(self.speech_buffer) >= self.min_partial_samples):
+            self._emit(final=False)
+        elif self.stream_interval_samples and len(self.speech_buffer) >= self.stream_interval_samples:
+            self._emit(final=False)
+        elif len(self.speech_buffer) >= self.max_speech_samples:
+            # Keep the utterance going instead of cutting it hard
+            self._split_long_speech()
+
+    def flush(self):
+        """End any utterance in progress, e.g. when a file source runs out."""
+        if self.speech_active:
+            self._end_utterance()
+
+
+class FirstTextLatency:
+    """End-of-speech to first-text latency, counted once per utterance."""
+
+    def __init__(self, max_samples=200):
+        self.samples_ms = deque(maxlen=max_samples)
+        self._last_utterance = None
+
+    def record(self, segment):
+        """Call when a segment produced text; returns the latency in ms or None."""
+        utterance_id = getattr(segment, "utterance_id", None)
+        if utterance_id is None or utterance_id == self._last_utterance:
+            return None
+        self._last_utterance = utterance_id
+        latency_ms = (time.time() - segment.speech_end_time) * 1000
+        self.samples_ms.append(latency_ms)
+        return latency_ms
+
+    def summary(self):
+        if not self.samples_ms:
+            return {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0}
+        ordered = sorted(self.samples_ms)
+        return {
+            "count": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered), 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1)
+        }
@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class AudioFrontEnd:
+    """Per-chunk clean-up before VAD/ASR: DC removal, high-pass, noise gate and AGC.
+
+    Every stage works on whole chunks with NumPy and keeps only a few
+    scalars plus the high-pass filter history between chunks.
+    """
+
+    def __init__(self, audio_config):
+        rate = audio_config.RATE
+        self.dc_alpha = 0.995  # ~6 s time constant at 30 ms chunks
+        self.dc_offset = 0.0
+
+        # Linear-phase FIR high-pass (spectral inversion of a windowed-sinc low-pass)
+        taps = audio_config.FRONTEND_HIGHPASS_TAPS | 1
+        n = np.arange(taps) - taps // 2
+        lowpass = np.sinc(2 * audio_config.FRONTEND_HIGHPASS_HZ / rate * n) * np.hamming(taps)
+        lowpass /= lowpass.sum()
+        self.highpass = -lowpass
+        self.highpass[taps // 2] += 1.0
+        self.history = np.zeros(taps - 1, dtype=np.float32)
+
+        # Energy noise gate with a slowly adapting noise floor (RMS, int16 scale)
+        self.noise_floor = audio_config.FRONTEND_NOISE_FLOOR
+        self.gate_ratio = audio_config.FRONTEND_GATE_RATIO
+        self.gate_attenuation = audio_config.FRONTEND_GATE_ATTENUATION
+        self.floor_fall = 0.1     # Follow quieter input quickly
+        self.floor_rise = 1.01    # Creep up ~2.6 dB/s so steady room noise ends up gated
+        self.calibration_chunks = 10  # First ~300 ms only measure the room
+
+        # Automatic gain towards a target speech RMS, applied as a per-chunk ramp
+        self.agc_target = audio_config.FRONTEND_AGC_TARGET_RMS
+        self.max_gain = audio_config.FRONTEND_AGC_MAX_GAIN
+        self.gain = 1.0
+        self.level = 1.0     # Gain actually applied at the end of the last chunk
+        self.attack = 0.5    # Fast gain reduction on loud input
+        self.release = 0.05  # Slow gain increase
+
+        self.chunks_processed = 0
+        self.chunks_gated = 0
+
+    def reset(self):
+        self.chunks_processed = 0
+        self.dc_offset = 0.0
+        self.history[:] = 0
+        self.gain = 1.0
+        self.level = 1.0
+
+    def process(self, samples):
+        """Return the cleaned-up chunk as int16 samples."""
+        x = samples.astype(np.float32)
+        self.chunks_processed += 1
+
+        # DC offset removal with a running mean of chunk means
+        self.dc_offset = self.dc_alpha * self.dc_offset + (1 - self.dc_alpha) * float(x.mean())
+        x -= self.dc_offset
+
+        # High-pass: convolve with the tail of the previous chunk to stay continuous
+        padded = np.concatenate([self.history, x])
+        self.history = padded[-len(self.history):]
+        x = np.convolve(padded, self.highpass, mode="valid").astype(np.float32)
+
+        rms = float(np.sqrt(np.mean(np.square(x)))) if len(x) else 0.0
+
+        # Noise floor tracking: calibrate on the first chunks, then fall fast, rise slowly
+        if self.chunks_processed <= self.calibration_chunks:
+            self.noise_floor = max(rms, 1.0) if self.chunks_processed == 1 else min(self.noise_floor, max(rms, 1.0))
+        elif rms < self.noise_floor:
+            self.noise_floor += self.floor_fall * (max(rms, 1.0) - self.noise_floor)
+        else:
+            self.noise_floor *= self.floor_rise
+
+        if self.chunks_processed <= self.calibration_chunks or rms < self.noise_floor * self.gate_ratio:
+            # Noise gate: chunks close to the noise floor are attenuated
+            self.chunks_gated += 1
+            level = self.gate_attenuation
+        else:
+            # AGC only adapts on chunks that passed the gate, so noise is never boosted
+            desired = min(self.agc_target / max(rms, 1e-3), self.max_gain)
+            rate = self.attack if desired < self.gain else self.release
+            self.gain += rate * (desired - self.gain)
+            level = self.gain
+
+        # Ramp from the previous level to avoid clicks at chunk boundaries
+        x *= np.linspace(self.level, level, len(x), dtype=np.float32)
+        self.level = level
+
+        return np.clip(x, -32768, 32767).astype(np.int16)
+
+    def get_stats(self):
+        return {
+            "chunks_processed": self.chunks_processed,
+            "chunks_gated": self.chunks_gated,
+            "noise_floor_rms": round(self.noise_floor, 1),
+            "agc_gain": round(self.gain, 2)
+        }
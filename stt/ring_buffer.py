@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity sample ring buffer that hands out contiguous, zero-copy views.
+
+    Every sample is written twice (at i and i + capacity), so the most recent
+    n <= capacity samples always sit contiguously in memory.
+    """
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(self.capacity * 2, dtype=self.dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """Forget all samples without releasing memory."""
+        self._head = 0
+        self._size = 0
+
+    def append(self, samples):
+        """Write samples, overwriting the oldest ones once full."""
+        samples = np.asarray(samples)
+        n = len(samples)
+        if n >= self.capacity:
+            # Only the tail can survive; lay it out from the start
+            self._data[:self.capacity] = samples[-self.capacity:]
+            self._data[self.capacity:] = self._data[:self.capacity]
+            self._head = 0
+            self._size = self.capacity
+            return
+
+        first = min(n, self.capacity - self._head)
+        end = self._head + first
+        self._data[self._head:end] = samples[:first]
+        self._data[self._head + self.capacity:end + self.capacity] = samples[:first]
+        rest = n - first
+        if rest:
+            self._data[:rest] = samples[first:]
+            self._data[self.capacity:self.capacity + rest] = samples[first:]
+
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def latest(self, n=None):
+        """Return a read-only view of the newest n samples (all by default).
+
+        The view is overwritten by later appends; copy it to keep it, or to
+        hand it to torch.from_numpy, which warns on read-only arrays.
+        """
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        view = self._data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+
+class SampleBuffer:
+    """Preallocated append-only buffer for assembling one utterance."""
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        """Start a new utterance in the same memory."""
+        self._size = 0
+
+    def append(self, samples):
+        """Append samples; raises ValueError if the utterance would overflow."""
+        n = len(samples)
+        if self._size + n > self.capacity:
+            raise ValueError(f"SampleBuffer overflow: {self._size + n} > {self.capacity} samples")
+        self._data[self._size:self._size + n] = samples
+        self._size += n
+
+    def view(self):
+        """Return a read-only view of the assembled samples.
+
+        The view is reused after clear(); copy it (e.g. tobytes()) to keep it,
+        or to hand it to torch.from_numpy, which warns on read-only arrays.
+        """
+        view = self._data[:self._size]
+        view.flags.writeable = False
+        return view
+
+
+class SPSCRingBuffer:
+    """Single-producer/single-consumer sample queue with no locks.
+
+    The producer only advances the write counter and the consumer only the
+    read counter; each counter is published after its copy, which is safe
+    under the GIL.
+    """
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._written = 0  # Total samples ever written (producer side)
+        self._read = 0     # Total samples ever read (consumer side)
+
+    def __len__(self):
+        return self._written - self._read
+
+    def write(self, samples):
+        """Copy as many samples as fit; returns how many were written."""
+        n = min(len(samples), self.capacity - (self._written - self._read))
+        start = self._written % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:n - first] = samples[first:n]
+        self._written += n
+        return n
+
+    def read(self, n):
+        """Return a copy of the next n samples, or None if fewer are available."""
+        if self._written - self._read < n:
+            return None
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out = np.empty(n, dtype=self._data.dtype)
+        out[:first] = self._data[start:start + first]
+        out[first:] = self._data[:n - first]
+        self._read += n
+        return out
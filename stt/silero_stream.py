@@ -0,0 +1,109 @@
+import numpy as np
+import torch
+
+from stt.ring_buffer import RingBuffer
+
+
+class StreamingSileroVAD:
+    """Feeds audio frame by frame into a stateful Silero-VAD model with hysteresis."""
+
+    def __init__(self, model, sample_rate=16000, threshold=0.5, neg_threshold=None,
+                 min_speech_ms=96, min_silence_ms=600):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.frame_size = 512 if sample_rate == 16000 else 256  # Required by Silero VAD
+        frame_ms = self.frame_size * 1000 / sample_rate
+
+        # Enter speech above threshold, leave only once below neg_threshold
+        self.threshold = threshold
+        self.neg_threshold = neg_threshold if neg_threshold is not None else max(threshold - 0.15, 0.01)
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.min_silence_frames = max(1, int(round(min_silence_ms / frame_ms)))
+
+        # Samples left over from the previous chunk (chunks are not frame aligned)
+        self._pending = np.zeros(self.frame_size, dtype=np.float32)
+        self._pending_len = 0
+
+        self.is_speaking = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.last_prob = 0.0
+        self.frames_processed = 0
+        self.frames_inferred = 0
+
+        # Recent audio replayed into the model when inference resumes after skipping
+        self.lookback = RingBuffer(self.frame_size * 3, dtype=np.float32)
+        self._skipping = False
+
+    def reset(self):
+        """Clear recurrent model state and hysteresis counters."""
+        if hasattr(self.model, "reset_states"):
+            self.model.reset_states()
+        self._pending_len = 0
+        self.is_speaking = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.last_prob = 0.0
+
+    def _frame_prob(self, frame):
+        """Run one frame through the model; recurrent state is kept inside the model."""
+        self.frames_inferred += 1
+        with torch.no_grad():
+            return self.model(torch.from_numpy(frame), self.sample_rate).item()
+
+    def _update_state(self, prob):
+        """Apply hysteresis to a single frame probability."""
+        self.last_prob = prob
+        self.frames_processed += 1
+
+        if prob >= self.threshold:
+            self.speech_frames += 1
+            self.silence_frames = 0
+        elif prob < self.neg_threshold:
+            self.silence_frames += 1
+            self.speech_frames = 0
+
+        if not self.is_speaking and self.speech_frames >= self.min_speech_frames:
+            self.is_speaking = True
+        elif self.is_speaking and self.silence_frames >= self.min_silence_frames:
+            self.is_speaking = False
+
+    def _warm_up(self):
+        """Reset the model and replay the lookback so it has context at speech onset."""
+        if hasattr(self.model, "reset_states"):
+            self.model.reset_states()
+        recent = self.lookback.latest()
+        usable = len(recent) // self.frame_size * self.frame_size
+        for frame in recent[len(recent) - usable:].copy().reshape(-1, self.frame_size):
+            self._frame_prob(frame)
+
+    def update(self, chunk, infer=True):
+        """Consume new int16 bytes or samples once each and return the current speech state.
+
+        With infer=False (a cheap gate ruled the chunk out) frames are counted
+        as silence without running the model.
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        elif chunk.dtype == np.int16:
+            samples = chunk.astype(np.float32) / 32768.0
+        else:
+            samples = chunk.astype(np.float32, copy=False)
+
+        if infer and self._skipping:
+            self._warm_up()
+        self._skipping = not infer
+        self.lookback.append(samples)
+
+        pos = 0
+        while pos < len(samples):
+            take = min(self.frame_size - self._pending_len, len(samples) - pos)
+            self._pending[self._pending_len:self._pending_len + take] = samples[pos:pos + take]
+            self._pending_len += take
+            pos += take
+
+            if self._pending_len == self.frame_size:
+                self._update_state(self._frame_prob(self._pending) if infer else 0.0)
+                self._pending_len = 0
+
+        return self.is_speaking
@@ -0,0 +1,32 @@
+import re
+
+_WORD_RE = re.compile(r"[^\w']+", flags=re.UNICODE)
+
+
+def _normalize(word):
+    return _WORD_RE.sub("", word.lower())
+
+
+def stitch_overlap(previous_text, text, max_overlap_words=8):
+    """Drop the words at the start of text that repeat the end of previous_text.
+
+    Consecutive overlapping segments transcribe the shared audio twice; the
+    repeat shows up as a run of words from the tail of the previous
+    transcript at the head of the new one. Single-word matches only count
+    for longer words, so "the"/"a" coincidences are left alone.
+    """
+    if not previous_text or not text:
+        return text
+
+    words = text.split()
+    tail = [_normalize(w) for w in previous_text.split()[-max_overlap_words:]]
+    head = [_normalize(w) for w in words[:max_overlap_words]]
+
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if k == 1 and len(head[0]) <= 3:
+            break
+        # The repeat may stop up to two words short of the previous segment's end
+        for start in range(len(tail) - k, max(len(tail) - k - 3, -1), -1):
+            if tail[start:start + k] == head[:k]:
+                return " ".join(words[k:])
+    return text
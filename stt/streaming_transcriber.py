@@ -0,0 +1,129 @@
+import re
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[^\w']+", flags=re.UNICODE)
+
+
+def _norm(word):
+    return _WORD_RE.sub("", word.lower())
+
+
+class StreamingTranscriber:
+    """Re-decodes a growing utterance buffer and commits text by local agreement.
+
+    Each segment from the endpointer is appended and the whole uncommitted
+    buffer is decoded again. Words that two consecutive passes agree on are
+    committed and their audio is trimmed away; the rest is reported as a
+    partial hypothesis. Events are (kind, text, language) tuples with kind
+    one of "commit" (newly stable words), "partial" (unstable tail) and
+    "final" (whole utterance once the speaker stops).
+    """
+
+    def __init__(self, transcriber, sample_rate=16000, trim_seconds=8.0, max_buffer_seconds=20.0):
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.trim_seconds = trim_seconds
+        self.max_buffer_seconds = max_buffer_seconds
+        self.utterance_id = None
+        self.last_confidence = None  # Confidence of the latest decode, for the confidence gate
+        self._reset()
+
+    def _reset(self):
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0   # Seconds of the utterance already trimmed away
+        self.committed = []        # (start, end, text) in utterance time
+        self.hypothesis = []       # Uncommitted words from the previous pass
+        self.language = None
+
+    def _committed_text(self):
+        return "".join(word for _, _, word in self.committed).strip()
+
+    def _decode(self):
+        """Decode the current buffer; word times are shifted to utterance time."""
+        prompt = self._committed_text()[-200:] or None
+        words, language, self.last_confidence = self.transcriber.transcribe_words(
+            self.audio, language=self.language, initial_prompt=prompt, with_confidence=True)
+        # The first pass of an utterance picks the language; later passes reuse it
+        if self.language is None and language in self.transcriber.lang_map:
+            self.language = language
+        return [(start + self.buffer_offset, end + self.buffer_offset, text) for start, end, text in words]
+
+    def _new_words(self, words):
+        """Drop words that belong to audio already committed or repeat its tail."""
+        last_end = self.committed[-1][1] if self.committed else 0.0
+        words = [w for w in words if w[0] > last_end - 0.1]
+
+        committed_tail = [_norm(w[2]) for w in self.committed[-5:]]
+        for n in range(min(len(committed_tail), len(words)), 0, -1):
+            if committed_tail[-n:] == [_norm(w[2]) for w in words[:n]]:
+                return words[n:]
+        return words
+
+    def _trim(self):
+        """Cut committed audio off the front of the buffer once it grows long."""
+        duration = len(self.audio) / self.sample_rate
+        if duration < self.trim_seconds or not self.committed:
+            return
+        cut_time = self.committed[-1][1] - self.buffer_offset
+        cut = int(max(0.0, cut_time) * self.sample_rate)
+        self.audio = self.audio[cut:]
+        self.buffer_offset += cut / self.sample_rate
+
+    def process_segment(self, segment):
+        """Feed one AudioSegment (or plain int16 bytes); returns a list of events."""
+        utterance_id = getattr(segment, "utterance_id", None)
+        final = getattr(segment, "final", True)
+        if utterance_id != self.utterance_id:
+            self._reset()
+            self.utterance_id = utterance_id
+
+        if segment:
+            samples = np.frombuffer(segment, dtype=np.int16).astype(np.float32) / 32768.0
+            # The buffer already holds any overlap repeated from the previous segment
+            samples = samples[getattr(segment, "overlap_samples", 0):]
+            self.audio = np.concatenate([self.audio, samples])
+
+        if final:
+            return self.finish()
+        if not len(self.audio):
+            return []
+
+        words = self._new_words(self._decode())
+
+        # Local agreement: commit the prefix both passes agree on
+        agreed = 0
+        while (agreed < len(words) and agreed < len(self.hypothesis)
+               and _norm(words[agreed][2]) == _norm(self.hypothesis[agreed][2])):
+            agreed += 1
+
+        events = []
+        if agreed:
+            self.committed.extend(words[:agreed])
+            events.append(("commit", "".join(w[2] for w in words[:agreed]).strip(), self.language))
+        self.hypothesis = words[agreed:]
+        if self.hypothesis:
+            events.append(("partial", "".join(w[2] for w in self.hypothesis).strip(), self.language))
+
+        # Never let an unstable buffer grow without bound
+        if len(self.audio) / self.sample_rate > self.max_buffer_seconds and self.hypothesis:
+            self.committed.extend(self.hypothesis)
+            events.append(("commit", "".join(w[2] for w in self.hypothesis).strip(), self.language))
+            self.hypothesis = []
+        self._trim()
+        return events
+
+    def finish(self):
+        """Decode what is left, commit it all and emit the final utterance text."""
+        events = []
+        if len(self.audio):
+            words = self._new_words(self._decode())
+            if words:
+                self.committed.extend(words)
+                events.append(("commit", "".join(w[2] for w in words).strip(), self.language))
+
+        text = self.transcriber._filter_hallucinations(self._committed_text())
+        if text:
+            events.append(("final", text, self.language))
+        self._reset()
+        return events
@@ -38,6 +38,30 @@ class VoiceActivityDetector:
                 if hasattr(self.model, buf):
                     getattr(self.model, buf).zero_()
 
+    def frame_probabilities(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """Return one speech probability per frame, keeping the model's recurrent state.
+
+        This cannot be a single batched forward pass: Silero carries an LSTM
+        state and the previous frame's tail from frame to frame, so a batch
+        of frames would be scored as independent streams from zero state, and
+        the model's own audio_forward resets the state on every call.
+        """
+        n_frames = -(-len(audio_chunk) // self.frame_size)
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        # Stack all frames into one zero-padded (n_frames, frame_size) tensor
+        frames = np.zeros(n_frames * self.frame_size, dtype=np.float32)
+        frames[:len(audio_chunk)] = audio_chunk
+        frames = torch.from_numpy(frames).view(n_frames, self.frame_size)
+        
+        # Frames go through in order since each one updates the state;
+        # probabilities stay on-device until a single read-back at the end
+        with torch.no_grad():
+            probs = torch.cat([self.model(frames[i:i + 1], self.sample_rate).reshape(1)
+                               for i in range(n_frames)])
+        return probs.cpu().numpy()
+
     def process_audio_chunk(self, audio_chunk: np.ndarray) -> bool:
         # Prepare audio chunk
         if audio_chunk.ndim > 1:
@@ -45,37 +69,15 @@ class VoiceActivityDetector:
         if audio_chunk.dtype != np.float32:
             audio_chunk = audio_chunk.astype(np.float32)
         
-        # Process in chunks of the correct size
-        speech_detected = False
         turn_ended = False
         
-        speech_probs = []
+        # Score every frame of the chunk with one read-back
+        speech_probs = self.frame_probabilities(audio_chunk)
+        speech_detected = bool((speech_probs >= self.threshold).any())
         
-        # Process audio in correct sized chunks for Silero VAD
-        for i in range(0, len(audio_chunk), self.frame_size):
-            # Get chunk of correct size
-            chunk = audio_chunk[i:i+self.frame_size]
-            
-            # If we don't have enough samples, pad with zeros
-            if len(chunk) < self.frame_size:
-                chunk = np.pad(chunk, (0, self.frame_size - len(chunk)))
-            
-            # Convert to tensor
-            audio_tensor = torch.tensor(chunk).to('cpu')
-            
-            # Get speech probability
-            
-            speech_prob = self.model(audio_tensor, self.sample_rate).item()
-            
-            speech_probs.append(speech_prob)
-            
-            # Update speaking state
-            if speech_prob >= self.threshold:
-                speech_detected = True
-                self.silent_frames = 0
-            else:
-                if self.is_speaking:
-                    self.silent_frames += 1
+        # Without speech, every frame of the chunk counts as silent
+        if not speech_detected and self.is_speaking:
+            self.silent_frames += len(speech_probs)
         
         # Print detailed speech detection information
         # print(f"Speech probabilities: {speech_probs}")
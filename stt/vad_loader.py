@@ -0,0 +1,129 @@
+import argparse
+import importlib.util
+import os
+import shutil
+import time
+
+import numpy as np
+import torch
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Vendored Silero-VAD weights live next to whisper_models/
+VAD_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vad_models")
+MODEL_FILES = {"torch": "silero_vad.jit", "onnx": "silero_vad.onnx"}
+
+
+class OnnxSileroVAD:
+    """ONNX Runtime Silero-VAD with the same call/reset interface as the JIT model."""
+
+    def __init__(self, path, num_threads=1):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed; use the torch VAD backend")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(path, sess_options=options,
+                                                    providers=["CPUExecutionProvider"])
+        self.reset_states()
+
+    def reset_states(self, batch_size=1):
+        self._state = np.zeros((2, batch_size, 128), dtype=np.float32)
+        self._context = None
+        self._last_sr = 0
+
+    def __call__(self, x, sr):
+        x = x.numpy() if hasattr(x, "numpy") else np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[np.newaxis, :]
+        if sr != self._last_sr:
+            self.reset_states(x.shape[0])
+            self._last_sr = sr
+
+        # The exported graph expects the tail of the previous frame as context
+        context_size = 64 if sr == 16000 else 32
+        if self._context is None:
+            self._context = np.zeros((x.shape[0], context_size), dtype=np.float32)
+        x = np.concatenate([self._context, x], axis=1)
+
+        out, self._state = self.session.run(None, {
+            "input": x,
+            "state": self._state,
+            "sr": np.array(sr, dtype=np.int64)
+        })
+        self._context = x[:, -context_size:]
+        return torch.from_numpy(out)
+
+
+def _speech_timestamps_fn():
+    """Find get_speech_timestamps offline (pip package or cached hub repo), else None."""
+    try:
+        from silero_vad import get_speech_timestamps
+        return get_speech_timestamps
+    except ImportError:
+        pass
+
+    # Import only the utilities module so the hub model is not loaded a second time
+    utils_path = os.path.join(torch.hub.get_dir(), "snakers4_silero-vad_master",
+                              "src", "silero_vad", "utils_vad.py")
+    if os.path.exists(utils_path):
+        spec = importlib.util.spec_from_file_location("silero_utils_vad", utils_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.get_speech_timestamps
+    return None
+
+
+def load_silero_vad(backend="torch", model_dir=VAD_MODEL_DIR):
+    """Load Silero-VAD from vad_models/ without network access.
+
+    Returns (model, get_speech_timestamps); the latter is None when no copy of
+    the Silero utilities is available (streaming VAD does not need it).
+    Raises FileNotFoundError when the weights have not been fetched.
+    """
+    start = time.perf_counter()
+    path = os.path.join(model_dir, MODEL_FILES[backend])
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Silero-VAD {backend} model not found at {path}. "
+            f"Run `python -m stt.vad_loader --fetch` once with network access.")
+
+    if backend == "onnx":
+        model = OnnxSileroVAD(path)
+    else:
+        model = torch.jit.load(path, map_location="cpu")
+        model.eval()
+
+    print(f"Silero-VAD ({backend}) loaded from {path} in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return model, _speech_timestamps_fn()
+
+
+def fetch_models(model_dir=VAD_MODEL_DIR):
+    """Copy the JIT and ONNX weights out of the torch.hub repo into model_dir."""
+    torch.hub.load("snakers4/silero-vad", model="silero_vad", trust_repo=True)
+    hub_repo = os.path.join(torch.hub.get_dir(), "snakers4_silero-vad_master")
+    data_dir = os.path.join(hub_repo, "src", "silero_vad", "data")
+
+    os.makedirs(model_dir, exist_ok=True)
+    for name in MODEL_FILES.values():
+        shutil.copy2(os.path.join(data_dir, name), os.path.join(model_dir, name))
+        print(f"Saved {os.path.join(model_dir, name)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the vendored Silero-VAD models")
+    parser.add_argument("--fetch", action="store_true", help="Download the models into vad_models/")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_models()
+    else:
+        for backend in MODEL_FILES:
+            try:
+                load_silero_vad(backend)
+            except Exception as e:
+                print(f"{backend}: {e}")
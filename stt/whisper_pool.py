@@ -0,0 +1,188 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+def _attach(name):
+    """Open a block created by the parent; only the parent tracks and unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _worker_main(index, task_queue, result_queue, current, profile, cpu_threads):
+    """Worker process: one CPU int8 model, transcribing segments from shared memory.
+
+    current[index] holds the sequence number being transcribed (-1 when
+    idle), so the parent can fail that segment if this process dies.
+    """
+    from stt.whisper_transcriber import WhisperTranscriber
+
+    transcriber = WhisperTranscriber(device="cpu", compute_type="int8", profile=profile, cpu_threads=cpu_threads)
+    transcriber.warm_up()  # Pay the first-call cost (and load route models) before taking segments
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        seq, shm_name, n_samples, task_profile = task
+        current[index] = seq
+        shm = _attach(shm_name)
+        try:
+            samples = np.ndarray((n_samples,), dtype=np.int16, buffer=shm.buf)
+            result = transcriber.transcribe(samples, task_profile, with_confidence=True)
+            del samples  # Release the view before closing the block
+        except Exception as e:
+            print(f"Transcription worker error: {str(e)}")
+            result = (None, None, None)
+        finally:
+            shm.close()
+        # Sticky-language and route state lives in the worker; report it with each result
+        stats = {
+            "language_tracker": transcriber.language_tracker.get_stats() if transcriber.language_tracker else None,
+            "routes": transcriber.get_route_stats(),
+            "load_ms": transcriber.load_times
+        }
+        current[index] = -1
+        result_queue.put((seq, index, result, stats))
+
+
+class WhisperWorkerPool:
+    """Transcribes segments in N worker processes, each with its own Whisper model.
+
+    Audio is handed over in shared memory blocks; only the block name goes
+    through the task queue. submit() returns a Future, so callers that keep
+    several segments in flight and wait on them first-in first-out get
+    results back in segment order. Workers are never restarted: by the time
+    one dies the parent holds models and threads, and forking from that
+    state can deadlock. A dead worker instead stops the pool, failing every
+    pending and new segment.
+    """
+
+    def __init__(self, num_workers, cpu_threads=2, profile="realtime"):
+        # Fork where available: spawn would re-run scripts like app2.py that build
+        # their pipeline at import time. Create the pool before loading other models.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+        self.context = context
+        self.profile = profile
+        self.cpu_threads = cpu_threads
+        self.task_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.current = context.Array("q", [-1] * num_workers, lock=False)  # Seq each worker is on
+        self.pending = {}  # seq -> (Future, SharedMemory)
+        self.lock = threading.Lock()
+        self._seq = itertools.count()
+        self.failed = None  # Reason the pool gave up, if it did
+        self.worker_stats = [None] * num_workers
+
+        self.workers = [self._start_worker(i) for i in range(num_workers)]
+
+        self.running = True
+        self.collector = threading.Thread(target=self._collect_results, name="WhisperPoolResults", daemon=True)
+        self.collector.start()
+        print(f"Whisper worker pool: {num_workers} processes x {cpu_threads} threads")
+
+    def _start_worker(self, index):
+        worker = self.context.Process(
+            target=_worker_main,
+            args=(index, self.task_queue, self.result_queue, self.current, self.profile, self.cpu_threads),
+            name=f"WhisperWorker-{index}", daemon=True)
+        worker.start()
+        return worker
+
+    def submit(self, audio_data, profile=None):
+        """Queue one int16 PCM segment; the Future resolves to (text, language, confidence)."""
+        if self.failed:
+            raise RuntimeError(f"Whisper worker pool stopped: {self.failed}")
+        future = Future()
+        n_bytes = len(audio_data)
+        shm = shared_memory.SharedMemory(create=True, size=max(n_bytes, 1))
+        shm.buf[:n_bytes] = audio_data
+
+        seq = next(self._seq)
+        with self.lock:
+            self.pending[seq] = (future, shm)
+        self.task_queue.put((seq, shm.name, n_bytes // 2, profile))
+        return future
+
+    def map(self, audio_list, profile=None):
+        """Transcribe a list of segments in parallel; results come back in input order."""
+        futures = [self.submit(audio_data, profile) for audio_data in audio_list]
+        return [future.result() for future in futures]
+
+    def _finish(self, seq, result=None, error=None):
+        with self.lock:
+            future, shm = self.pending.pop(seq, (None, None))
+        if future is None:
+            return
+        shm.close()
+        shm.unlink()
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _check_workers(self):
+        """If any worker has died, fail its segment and stop the pool."""
+        for index, worker in enumerate(self.workers):
+            if worker.is_alive() or self.failed:
+                continue
+            seq, self.current[index] = self.current[index], -1
+            print(f"Whisper worker {worker.name} exited (code {worker.exitcode}); stopping the worker pool")
+            if seq >= 0:
+                self._finish(seq, error=RuntimeError(f"{worker.name} exited while transcribing"))
+            self.failed = f"{worker.name} exited (code {worker.exitcode})"
+            with self.lock:
+                pending = list(self.pending)
+            for seq in pending:
+                self._finish(seq, error=RuntimeError(f"Whisper worker pool stopped: {self.failed}"))
+
+    def _collect_results(self):
+        while self.running:
+            try:
+                seq, index, result, stats = self.result_queue.get(timeout=0.5)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            self.worker_stats[index] = stats
+            self._finish(seq, result)
+            self._check_workers()
+
+    def get_stats(self):
+        return {
+            "workers": len(self.workers),
+            "alive": sum(worker.is_alive() for worker in self.workers),
+            "in_flight": len(self.pending),
+            "failed": self.failed
+        }
+
+    def get_worker_stats(self):
+        """Latest language tracker, route and load stats reported by each worker (None before its first result)."""
+        return list(self.worker_stats)
+
+    def close(self):
+        """Stop the workers and free any shared memory still in flight."""
+        self.failed = self.failed or "closed"
+        for _ in self.workers:
+            self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self.running = False
+        self.collector.join(timeout=1.0)
+        with self.lock:
+            for future, shm in self.pending.values():
+                shm.close()
+                shm.unlink()
+                future.cancel()
+            self.pending.clear()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import time
+
+from faster_whisper import WhisperModel
+
+# Bundled faster-whisper snapshots, in the Hugging Face cache layout
+WHISPER_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "whisper_models")
+REPO_PREFIX = "models--Systran--faster-whisper-"
+
+
+def _is_lfs_pointer(path):
+    """True for a Git LFS pointer file checked out instead of the real weights."""
+    if os.path.getsize(path) > 1024:
+        return False
+    with open(path, "rb") as f:
+        return f.read(40).startswith(b"version https://git-lfs")
+
+
+def bundled_models(model_dir=WHISPER_MODEL_DIR):
+    """Model names with a snapshot under model_dir, e.g. ["small"]."""
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(name[len(REPO_PREFIX):] for name in os.listdir(model_dir) if name.startswith(REPO_PREFIX))
+
+
+def resolve_model(name, model_dir=WHISPER_MODEL_DIR):
+    """Map a model name (or a model directory) to a local snapshot directory."""
+    if os.path.isdir(name):
+        return name
+
+    repo_dir = os.path.join(model_dir, REPO_PREFIX + name)
+    ref_path = os.path.join(repo_dir, "refs", "main")
+    if not os.path.exists(ref_path):
+        raise FileNotFoundError(
+            f"Whisper model '{name}' is not bundled in {model_dir} (have: {', '.join(bundled_models(model_dir)) or 'none'}). "
+            f"Run `python -m stt.whisper_registry --fetch {name}` once with network access.")
+
+    with open(ref_path) as f:
+        snapshot_dir = os.path.join(repo_dir, "snapshots", f.read().strip())
+    weights = os.path.join(snapshot_dir, "model.bin")
+    if not os.path.exists(weights) or _is_lfs_pointer(weights):
+        raise FileNotFoundError(f"Whisper weights missing at {weights}; run `git lfs pull` or fetch the model again.")
+    return snapshot_dir
+
+
+def _prefetch(path):
+    """Ask the kernel to read the weights into the page cache ahead of the load."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def load_whisper_model(name, device="cpu", compute_type="int8", cpu_threads=0, model_dir=WHISPER_MODEL_DIR):
+    """Load a faster-whisper model from its bundled snapshot without network access."""
+    start = time.perf_counter()
+    path = resolve_model(name, model_dir)
+    _prefetch(os.path.join(path, "model.bin"))
+
+    model = WhisperModel(path, device=device, compute_type=compute_type,
+                         cpu_threads=cpu_threads, local_files_only=True)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Whisper {name} ({device}, {compute_type}) loaded from {path} in {load_ms:.0f}ms")
+    return model, load_ms
+
+
+def fetch_model(name, model_dir=WHISPER_MODEL_DIR):
+    """Download a faster-whisper model into model_dir in the cache layout."""
+    from faster_whisper.utils import download_model
+    path = download_model(name, cache_dir=model_dir)
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the bundled Whisper models")
+    parser.add_argument("--fetch", metavar="NAME", help="Download a model (e.g. small, base) into whisper_models/")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_model(args.fetch)
+    else:
+        for name in bundled_models():
+            try:
+                print(f"{name}: {resolve_model(name)}")
+            except Exception as e:
+                print(f"{name}: {e}")
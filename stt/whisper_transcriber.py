@@ -1,18 +1,33 @@
 import numpy as np
 import torch
-from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+import threading
 import time
 import re
+import zlib
+
+from language_detection.language_tracker import LanguageTracker
+from stt.whisper_registry import load_whisper_model, resolve_model
+from utils.config import WhisperConfig
 
 class WhisperTranscriber:
     """Transcribes audio to text using Whisper."""
-    def __init__(self):
-        print("Loading multilingual Whisper model...")
-        self.model = WhisperModel(
-            "small",
-            device="cuda" if torch.cuda.is_available() else "cpu",
-            compute_type="float16" if torch.cuda.is_available() else "int8"
-        )
+    def __init__(self, device=None, compute_type=None, profile=None, cpu_threads=0):
+        whisper_config = WhisperConfig()
+        self.profiles = whisper_config.profiles
+        self.profile = profile or whisper_config.PROFILE
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.compute_type = compute_type  # Overrides the profiles' compute type
+        self.cpu_threads = cpu_threads  # 0 lets CTranslate2 pick
+        self.models = {}  # (model size, compute type) -> WhisperModel
+        self.load_times = {}  # "size/compute type" -> load time in ms
+        self._model_lock = threading.Lock()
+        self.model = self._get_model(self._profile_settings(self.profile))
+
+        # Faster per-language models, used once the tracker has locked a language
+        self.language_routes = self._check_routes(whisper_config.LANGUAGE_ROUTES)
+        self.route_stats = {}  # "language:model" -> segments, decode time, audio seconds
 
         # Language code mapping
         self.lang_map = {
@@ -27,7 +42,119 @@ class WhisperTranscriber:
             r'^\s*thank you\s*$',  # Just "thank you" alone
             r'^\s*thanks\s*$',  # Just "thanks" alone
         ]
+
+        # Skip Whisper's language ID once the speaker's language is stable
+        self.language_tracker = LanguageTracker(
+            self.lang_map,
+            stable_segments=whisper_config.STICKY_STABLE_SEGMENTS,
+            min_probability=whisper_config.STICKY_MIN_PROBABILITY,
+            min_logprob=whisper_config.STICKY_MIN_LOGPROB,
+            recheck_every=whisper_config.STICKY_RECHECK_EVERY
+        ) if whisper_config.STICKY_LANGUAGE else None
+
+        # Optional callable(language) -> (initial_prompt, hotwords), e.g. WhisperPromptBuilder.build
+        self.prompt_source = None
+        self.decode_stats = {"segments": 0, "fallbacks": 0}
         
+    def _profile_settings(self, profile=None):
+        """Decoding settings for a named profile (the pipeline's own by default)."""
+        name = profile or self.profile
+        if name not in self.profiles:
+            raise ValueError(f"Unknown decoding profile: {name} (choose from {', '.join(self.profiles)})")
+        return self.profiles[name]
+
+    def _get_model(self, settings, model_name=None):
+        """Load a model (the profile's by default) on first use; profiles sharing a model share it."""
+        model_name = model_name or settings["model"]
+        compute_type = (self.compute_type or settings["compute_type"]
+                        or ("float16" if self.device == "cuda" else "int8"))
+        key = (model_name, compute_type)
+        with self._model_lock:
+            if key not in self.models:
+                print(f"Loading Whisper model ({model_name}, {compute_type})...")
+                self.models[key], load_ms = load_whisper_model(model_name, self.device, compute_type,
+                                                               self.cpu_threads)
+                self.load_times[f"{model_name}/{compute_type}"] = round(load_ms)
+        return self.models[key]
+
+    @staticmethod
+    def _check_routes(routes):
+        """Keep the routes whose model is bundled in whisper_models/ and log which are active."""
+        active = {}
+        for language, model_name in routes.items():
+            try:
+                resolve_model(model_name)
+                active[language] = model_name
+            except FileNotFoundError as e:
+                print(f"Whisper route {language}:{model_name} disabled: {e}")
+        if routes:
+            print(f"Whisper language routes active: "
+                  f"{', '.join(f'{language}:{model}' for language, model in active.items()) or 'none'}")
+        return active
+
+    def _route(self, settings, language):
+        """Pick the model for a segment: the language's route once it is locked, else multilingual."""
+        route_model = self.language_routes.get(language) if language else None
+        if route_model:
+            try:
+                return self._get_model(settings, route_model), f"{language}:{route_model}"
+            except Exception as e:
+                print(f"Whisper route {language}:{route_model} unavailable ({e}); using the multilingual model")
+                self.language_routes.pop(language, None)
+        return self._get_model(settings), f"multilingual:{settings['model']}"
+
+    def _record_route(self, route, elapsed, audio_seconds):
+        stats = self.route_stats.setdefault(route, {"segments": 0, "decode_s": 0.0, "audio_s": 0.0})
+        stats["segments"] += 1
+        stats["decode_s"] += elapsed
+        stats["audio_s"] += audio_seconds
+
+    def get_route_stats(self):
+        """Per-route segment count, average decode latency and real-time factor."""
+        return {
+            route: {
+                "segments": stats["segments"],
+                "avg_ms": round(stats["decode_s"] / stats["segments"] * 1000, 1),
+                "rtf": round(stats["decode_s"] / stats["audio_s"], 3) if stats["audio_s"] else 0.0
+            }
+            for route, stats in self.route_stats.items()
+        }
+
+    @staticmethod
+    def _compression_ratio(text):
+        """gzip-style ratio Whisper uses to spot repetitive output."""
+        data = text.encode("utf-8")
+        return len(data) / len(zlib.compress(data)) if data else 0.0
+
+    @staticmethod
+    def _confidence(segment_scores):
+        """Summarize per-segment scores: token-weighted log-prob, worst no-speech and compression."""
+        if not segment_scores:
+            return None
+        weights = [max(score["tokens"], 1) for score in segment_scores]
+        return {
+            "avg_logprob": sum(w * score["avg_logprob"] for w, score in zip(weights, segment_scores)) / sum(weights),
+            "no_speech_prob": max(score["no_speech_prob"] for score in segment_scores),
+            "compression_ratio": max(score["compression_ratio"] for score in segment_scores),
+            "segments": segment_scores
+        }
+
+    def warm_up(self):
+        """Decode two seconds of synthetic voiced audio with every loaded model."""
+        t = np.arange(32000, dtype=np.float32) / 16000
+        audio = sum(np.sin(2 * np.pi * 140 * h * t) / h for h in range(1, 5)) * 0.1 * np.sin(np.pi * t / 2) ** 2
+        settings = self._profile_settings()
+        for language in list(self.language_routes):
+            self._route(settings, language)  # Load route models now rather than on first use
+        for model in list(self.models.values()):
+            segments, _ = model.transcribe(audio.astype(np.float32), beam_size=settings["beam_size"],
+                                           without_timestamps=True)
+            list(segments)
+
+    def count_tokens(self, text):
+        """Number of Whisper tokens in text, for prompt budgets."""
+        return len(self.model.hf_tokenizer.encode(text, add_special_tokens=False).ids)
+
     def _filter_hallucinations(self, text):
         """Filter out common hallucinations while preserving legitimate uses."""
         if not text:
@@ -41,44 +168,247 @@ class WhisperTranscriber:
         # Otherwise return the original text
         return text
     
-    def transcribe(self, audio_data):
-        """Transcribe audio data and detect language."""
+    def transcribe(self, audio_data, profile=None, initial_prompt=None, hotwords=None, with_confidence=False):
+        """Transcribe audio data and detect language.
+
+        With with_confidence=True a third item is returned: avg_logprob,
+        no_speech_prob and compression_ratio for the segment and per Whisper
+        segment, plus Whisper's language_probs (None when nothing was decoded).
+        """
+        result = self._transcribe(audio_data, profile, initial_prompt, hotwords)
+        return result if with_confidence else result[:2]
+
+    def _transcribe(self, audio_data, profile, initial_prompt, hotwords):
+        settings = self._profile_settings(profile)
+        language = self.language_tracker.language_hint() if self.language_tracker else None
+        model, route = self._route(settings, language)
         try:
+            if initial_prompt is None and hotwords is None and self.prompt_source:
+                initial_prompt, hotwords = self.prompt_source(language)
             # Convert audio bytes to numpy array
             audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
 
             # Start timing the actual transcription
-            start = time.time()
-            segments, info = self.model.transcribe(
+            start = time.perf_counter()
+            segments, info = model.transcribe(
                 audio_np,
-                beam_size=5,
-                best_of=5,
-                patience=0.1,
+                beam_size=settings["beam_size"],
+                best_of=settings["best_of"],
+                patience=settings["patience"],
                 length_penalty=1.0,
-                temperature=0.0,
+                temperature=settings["temperature"],
                 compression_ratio_threshold=2.4,
                 log_prob_threshold=-1.0,
                 no_speech_threshold=0.6,
-                condition_on_previous_text=True,
-                language=None,
+                condition_on_previous_text=settings["condition_on_previous_text"],
+                language=language,
+                initial_prompt=initial_prompt,
+                hotwords=hotwords,
                 without_timestamps=True
             )
             
             # Process results
+            segments = list(segments)
+            self._record_route(route, time.perf_counter() - start, len(audio_np) / 16000)
+            # A segment decoded above the first temperature was a fallback re-decode
+            self.decode_stats["segments"] += len(segments)
+            self.decode_stats["fallbacks"] += sum(
+                1 for segment in segments if segment.temperature > settings["temperature"][0])
             raw_text = " ".join(segment.text for segment in segments).strip()
+            if self.language_tracker and segments:
+                avg_logprob = sum(segment.avg_logprob for segment in segments) / len(segments)
+                self.language_tracker.update(info.language, info.language_probability, avg_logprob,
+                                             forced=language is not None)
             
             # Apply hallucination filter (only removes complete-utterance hallucinations)
             filtered_text = self._filter_hallucinations(raw_text)
             
+            confidence = self._confidence([{
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob,
+                "compression_ratio": segment.compression_ratio,
+                "tokens": len(segment.tokens)
+            } for segment in segments])
+            if confidence:
+                # Whisper's distribution over our languages; None when the language was forced
+                confidence["language_probs"] = (
+                    {lang: p for lang, p in info.all_language_probs if lang in self.lang_map}
+                    if info.all_language_probs else None)
+
             if filtered_text:
                 # Map Whisper language to our language codes
                 detected_lang = None
                 if info.language in self.lang_map:
                     detected_lang = self.lang_map[info.language]
-                return filtered_text, detected_lang
+                return filtered_text, detected_lang, confidence
             
-            return None, None
+            return None, None, confidence
             
         except Exception as e:
             print(f"Transcription error: {str(e)}")
-            return None, None
\ No newline at end of file
+            return None, None, None
+
+    def transcribe_words(self, audio_np, language=None, initial_prompt=None, beam_size=1, with_confidence=False,
+                         profile=None):
+        """Decode float32 audio into word timestamps for streaming re-decodes.
+
+        Returns (words, language) where words is a list of (start, end, text)
+        in seconds from the start of audio_np, plus the decode's confidence
+        (as in transcribe) with with_confidence=True. The model is chosen as
+        in transcribe (profile, then the locked language's route); decoding is
+        greedy by default since the streaming transcriber decodes the same
+        audio several times. Only decodes that detect the language themselves
+        update the language tracker, so re-decodes are not counted again.
+        """
+        settings = self._profile_settings(profile)
+        hint = self.language_tracker.language_hint() if self.language_tracker else None
+        model, route = self._route(settings, language or hint)
+        try:
+            start = time.perf_counter()
+            segments, info = model.transcribe(
+                audio_np,
+                beam_size=beam_size,
+                temperature=0.0,
+                compression_ratio_threshold=2.4,
+                log_prob_threshold=-1.0,
+                no_speech_threshold=0.6,
+                condition_on_previous_text=False,
+                initial_prompt=initial_prompt,
+                language=language or hint,
+                word_timestamps=True,
+                vad_filter=False
+            )
+
+            words, segment_scores = [], []
+            for segment in segments:
+                for word in segment.words or []:
+                    words.append((word.start, word.end, word.word))
+                segment_scores.append({
+                    "text": segment.text,
+                    "avg_logprob": segment.avg_logprob,
+                    "no_speech_prob": segment.no_speech_prob,
+                    "compression_ratio": segment.compression_ratio,
+                    "tokens": len(segment.tokens)
+                })
+            self._record_route(route, time.perf_counter() - start, len(audio_np) / 16000)
+            if self.language_tracker and language is None and segment_scores:
+                avg_logprob = sum(score["avg_logprob"] for score in segment_scores) / len(segment_scores)
+                self.language_tracker.update(info.language, info.language_probability, avg_logprob,
+                                             forced=hint is not None)
+        except Exception as e:
+            print(f"Transcription error: {str(e)}")
+            return ([], None, None) if with_confidence else ([], None)
+
+        if with_confidence:
+            return words, info.language, self._confidence(segment_scores)
+        return words, info.language
+
+    def transcribe_batch(self, audio_list, profile=None, with_confidence=False):
+        """Transcribe several queued segments with one batched encoder/decoder pass.
+
+        Returns a list of (text, language) in the same order as audio_list
+        (plus confidence, as in transcribe, with with_confidence=True); each
+        segment gets its own detected language. The batch decodes once with
+        the profile's beam at its first temperature; when the profile has a
+        fallback ladder, segments that fail its thresholds are re-decoded
+        one by one through transcribe.
+        """
+        settings = self._profile_settings(profile)
+        hint = self.language_tracker.language_hint() if self.language_tracker else None
+        model, route = self._route(settings, hint)
+        results = [(None, None, None)] * len(audio_list)
+        batch, positions = [], []
+        for i, audio_data in enumerate(audio_list):
+            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            if len(audio_np) > model.feature_extractor.n_samples:
+                results[i] = self._transcribe(audio_data, profile, None, None)  # Longer than one 30 s window
+            elif len(audio_np):
+                batch.append(audio_np)
+                positions.append(i)
+
+        if batch:
+            try:
+                start = time.perf_counter()
+                for i, result in zip(positions, self._decode_batch(model, batch, settings)):
+                    results[i] = result
+                elapsed = time.perf_counter() - start
+                for audio_np in batch:
+                    self._record_route(route, elapsed / len(batch), len(audio_np) / 16000)
+            except Exception as e:
+                print(f"Batch transcription error: {str(e)}")
+
+            for i in positions:
+                if len(settings["temperature"]) > 1 and self._needs_fallback(results[i][2]):
+                    results[i] = self._transcribe(audio_list[i], profile, None, None)
+                else:
+                    self.decode_stats["segments"] += 1
+        return results if with_confidence else [result[:2] for result in results]
+
+    @staticmethod
+    def _needs_fallback(confidence):
+        """Same thresholds transcribe() passes to Whisper: repetitive or low log-prob output that is not silence."""
+        if not confidence:
+            return False
+        silent = confidence["no_speech_prob"] > 0.6 and confidence["avg_logprob"] < -1.0
+        return not silent and (confidence["compression_ratio"] > 2.4 or confidence["avg_logprob"] < -1.0)
+
+    def _decode_batch(self, model, batch, settings):
+        """Encode all segments together, detect each language, then decode as one batch."""
+        extractor = model.feature_extractor
+        features = np.stack([pad_or_trim(extractor(audio), extractor.nb_max_frames) for audio in batch])
+        encoder_output = model.encode(features)
+
+        hint = self.language_tracker.language_hint() if self.language_tracker else None
+        if hint:
+            detected = [(hint, None)] * len(batch)
+            all_probs = [None] * len(batch)
+        else:
+            all_probs = [{token[2:-2]: p for token, p in lang_probs}  # "<|en|>" -> "en"
+                         for lang_probs in model.model.detect_language(encoder_output)]
+            detected = [max(probs.items(), key=lambda item: item[1]) for probs in all_probs]
+
+        prompts = []
+        for language, _ in detected:
+            tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual,
+                                  task="transcribe", language=language)
+            prompts.append(list(tokenizer.sot_sequence) + [tokenizer.no_timestamps])
+
+        outputs = model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=settings["beam_size"],
+            patience=settings["patience"],
+            length_penalty=1.0,
+            max_length=model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True
+        )
+
+        results = []
+        for (language, probability), probs, output in zip(detected, all_probs, outputs):
+            # scores[0] is the cumulative log-prob divided by length ** length_penalty (1.0);
+            # rescale it to faster-whisper's avg_logprob, cumulative / (tokens + 1)
+            tokens = len(output.sequences_ids[0])
+            avg_logprob = output.scores[0] * tokens / (tokens + 1)
+            if self.language_tracker:
+                self.language_tracker.update(language, probability, avg_logprob, forced=hint is not None)
+            tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual,
+                                  task="transcribe", language=language)
+            raw_text = tokenizer.decode(output.sequences_ids[0]).strip()
+            confidence = self._confidence([{
+                "text": raw_text,
+                "avg_logprob": avg_logprob,
+                "no_speech_prob": output.no_speech_prob,
+                "compression_ratio": self._compression_ratio(raw_text),
+                "tokens": tokens
+            }])
+            confidence["language_probs"] = (
+                {lang: p for lang, p in probs.items() if lang in self.lang_map} if probs else None)
+            # Same silence rule as no_speech_threshold/log_prob_threshold in transcribe()
+            if output.no_speech_prob > 0.6 and avg_logprob < -1.0:
+                results.append((None, None, confidence))
+                continue
+            text = self._filter_hallucinations(raw_text)
+            results.append((text, self.lang_map.get(language), confidence) if text else (None, None, confidence))
+        return results
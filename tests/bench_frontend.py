@@ -0,0 +1,83 @@
+import argparse
+import queue
+import time
+import wave
+
+import numpy as np
+import webrtcvad
+
+from stt.endpointer import Endpointer
+from stt.frontend import AudioFrontEnd
+from utils.config import AudioConfig
+
+
+def noisy_room(seconds=60, bursts=6, rate=16000):
+    """Mains hum, fan noise and a DC offset, with a few voiced speech-like bursts."""
+    rng = np.random.default_rng(1)
+    t = np.arange(seconds * rate) / rate
+    audio = 1500 + 900 * np.sin(2 * np.pi * 50 * t) + np.cumsum(rng.normal(0, 60, len(t))) % 800
+    audio += rng.normal(0, 500, len(t))
+
+    burst_t = t[:2 * rate]
+    voiced = sum(np.sin(2 * np.pi * f0 * burst_t) / k for k, f0 in enumerate((140, 280, 420, 560), 1))
+    envelope = np.sin(2 * np.pi * 2 * burst_t) ** 2
+    for start in np.linspace(5, seconds - 5, bursts).astype(int):
+        audio[start * rate:(start + 2) * rate] += 6000 * voiced * envelope
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def count_utterances(audio, config, frontend=None):
+    """Run the webrtcvad recorder logic over audio; returns (utterances, front-end CPU s)."""
+    vad = webrtcvad.Vad(config.VAD_AGGRESSIVENESS)
+    segments = queue.Queue()
+    endpointer = Endpointer(config, segments)
+    max_silence_chunks = int(0.30 * 1000 / config.CHUNK_DURATION_MS)
+    speech_active, silence_chunks, frontend_cpu = False, 0, 0.0
+
+    for pos in range(0, len(audio) - config.CHUNK_SIZE + 1, config.CHUNK_SIZE):
+        samples = audio[pos:pos + config.CHUNK_SIZE]
+        if frontend:
+            start = time.process_time()
+            samples = frontend.process(samples)
+            frontend_cpu += time.process_time() - start
+
+        is_speech = vad.is_speech(samples.tobytes(), config.RATE)
+        if is_speech:
+            speech_active, silence_chunks = True, 0
+        elif speech_active:
+            silence_chunks += 1
+            speech_active = silence_chunks < max_silence_chunks
+        endpointer.process(samples, speech_active, not is_speech)
+    endpointer.flush()
+
+    utterances = {segments.get().utterance_id for _ in range(segments.qsize())}
+    return len(utterances), frontend_cpu
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audio front-end cost and false segments (run as: python -m tests.bench_frontend)")
+    parser.add_argument("--wav", help="16 kHz mono int16 WAV recorded in a noisy room (default: synthetic)")
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--bursts", type=int, default=6)
+    args = parser.parse_args()
+
+    config = AudioConfig()
+    audio = load_wav(args.wav) if args.wav else noisy_room(args.seconds, args.bursts)
+    duration = len(audio) / config.RATE
+
+    print(f"\n=== Front-end benchmark ({duration:.0f}s of audio) ===\n")
+    raw_count, _ = count_utterances(audio, config)
+    frontend = AudioFrontEnd(config)
+    clean_count, cpu = count_utterances(audio, config, frontend)
+
+    print(f"  Front-end cost: {cpu / duration * 1000:.2f} ms CPU per audio second")
+    print(f"  Utterances without front-end: {raw_count}")
+    print(f"  Utterances with front-end:    {clean_count}")
+    if not args.wav:
+        print(f"  Speech bursts in the signal:  {args.bursts}")
+    print(f"  Front-end stats: {frontend.get_stats()}")
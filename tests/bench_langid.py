@@ -0,0 +1,78 @@
+import argparse
+import time
+
+from language_detection.ngram_classifier import NgramLanguageClassifier
+
+try:
+    from langdetect import DetectorFactory, detect, LangDetectException
+    LANGDETECT_AVAILABLE = True
+except ImportError:
+    LANGDETECT_AVAILABLE = False
+
+# Short utterances as Whisper returns them mid-conversation
+SHORT_UTTERANCES = [
+    ("en", "Yes, of course."), ("en", "I don't think so."), ("en", "Where is the station?"),
+    ("en", "Thanks a lot."), ("en", "Can you help me?"), ("en", "It's getting late."),
+    ("en", "What time is it?"), ("en", "See you tomorrow."), ("en", "That sounds good."),
+    ("en", "I'm not sure."), ("en", "Let me check."), ("en", "We need more time."),
+    ("es", "Sí, claro."), ("es", "No lo sé."), ("es", "¿Dónde está la estación?"),
+    ("es", "Muchas gracias."), ("es", "¿Puedes ayudarme?"), ("es", "Ya es tarde."),
+    ("es", "¿Qué hora es?"), ("es", "Hasta mañana."), ("es", "Me parece bien."),
+    ("es", "No estoy seguro."), ("es", "Déjame ver."), ("es", "Necesitamos más tiempo."),
+    ("fr", "Oui, bien sûr."), ("fr", "Je ne pense pas."), ("fr", "Où est la gare ?"),
+    ("fr", "Merci beaucoup."), ("fr", "Tu peux m'aider ?"), ("fr", "Il se fait tard."),
+    ("fr", "Quelle heure est-il ?"), ("fr", "À demain."), ("fr", "Ça me va."),
+    ("fr", "Je ne suis pas sûr."), ("fr", "Laisse-moi voir."), ("fr", "Il nous faut plus de temps."),
+]
+
+
+def load_tsv(path):
+    """Rows of `lang<TAB>text`."""
+    with open(path, encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t", 1)) for line in f if "\t" in line]
+
+
+def bench(detect_fn, items, repeats):
+    """Returns (utterances per second, accuracy, share of utterances with no answer)."""
+    answers = [detect_fn(text) for _, text in items]
+    correct = sum(answer == lang for answer, (lang, _) in zip(answers, items))
+    abstained = sum(answer is None for answer in answers)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for _, text in items:
+            detect_fn(text)
+    elapsed = time.perf_counter() - start
+    return repeats * len(items) / elapsed, correct / len(items), abstained / len(items)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="n-gram language ID vs langdetect on short utterances (run as: python -m tests.bench_langid)")
+    parser.add_argument("--tsv", help="File of `lang<TAB>text` rows (default: built-in en/es/fr set)")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    items = load_tsv(args.tsv) if args.tsv else SHORT_UTTERANCES
+    languages = sorted({lang for lang, _ in items})
+
+    print(f"\n=== Language ID benchmark ({len(items)} utterances, {', '.join(languages)}) ===\n")
+    classifier = NgramLanguageClassifier(languages)
+    rate, accuracy, abstained = bench(lambda text: classifier.classify(text)[0], items, args.repeats)
+    print(f"  n-gram classifier: {rate:8.0f} utterances/s, accuracy {accuracy * 100:.1f}%, "
+          f"abstained {abstained * 100:.1f}% (below {classifier.min_confidence})")
+
+    if LANGDETECT_AVAILABLE:
+        def langdetect_fn(text):
+            try:
+                return detect(text)
+            except LangDetectException:
+                return None
+
+        # Unseeded langdetect may answer differently on each run for short inputs
+        runs = [[langdetect_fn(text) for _, text in items] for _ in range(3)]
+        unstable = sum(len({run[i] for run in runs}) > 1 for i in range(len(items)))
+        DetectorFactory.seed = 0
+        rate, accuracy, _ = bench(langdetect_fn, items, max(1, args.repeats // 10))
+        print(f"  langdetect:        {rate:8.0f} utterances/s, accuracy {accuracy * 100:.1f}% "
+              f"(seeded; {unstable} answers changed across unseeded runs)")
+    else:
+        print("  langdetect not installed; skipped")
@@ -0,0 +1,91 @@
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from translation.micro_batcher import TranslationBatcher
+from translation.translator2 import Translator
+from utils.config import Languages
+
+SENTENCES = {
+    "en": [
+        "Hello, how are you today?", "Where is the nearest train station?",
+        "I would like to book a table for two people tonight.", "Thanks a lot.",
+        "Could you please send me the report before the meeting tomorrow morning?",
+        "The weather has been unusually warm this week.", "Let me check.",
+        "We need to talk about the budget for next quarter and the hiring plan."
+    ],
+    "es": [
+        "Hola, ¿cómo estás hoy?", "¿Dónde está la estación de tren más cercana?",
+        "Me gustaría reservar una mesa para dos personas esta noche.", "Muchas gracias.",
+        "¿Podrías enviarme el informe antes de la reunión de mañana por la mañana?",
+        "El tiempo ha sido inusualmente cálido esta semana.", "Déjame ver.",
+        "Tenemos que hablar del presupuesto del próximo trimestre y del plan de contratación."
+    ],
+    "fr": [
+        "Bonjour, comment allez-vous aujourd'hui ?", "Où est la gare la plus proche ?",
+        "Je voudrais réserver une table pour deux personnes ce soir.", "Merci beaucoup.",
+        "Pourriez-vous m'envoyer le rapport avant la réunion de demain matin ?",
+        "Il a fait exceptionnellement chaud cette semaine.", "Laisse-moi voir.",
+        "Nous devons parler du budget du prochain trimestre et du plan de recrutement."
+    ]
+}
+
+
+def run_load(translator, sources, requests, rate, window_ms, max_batch, seed=0):
+    """Submit requests with Poisson arrivals at `rate` per second; returns (throughput, p50 ms, p95 ms, batcher stats)."""
+    rng = random.Random(seed)
+    batcher = TranslationBatcher(
+        lambda texts, source_lang, target_lang: translator.translate_batch(texts, source_lang, target_lang),
+        max_batch, window_ms)
+    latencies = []
+    lock = threading.Lock()
+
+    def record(submitted):
+        def done(_):
+            with lock:
+                latencies.append(time.perf_counter() - submitted)
+        return done
+
+    futures = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        source = rng.choice(sources)
+        future = batcher.submit(rng.choice(SENTENCES[source]), source, translator.target_lang)
+        future.add_done_callback(record(time.perf_counter()))
+        futures.append(future)
+        time.sleep(rng.expovariate(rate))
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    batcher.close()
+
+    ms = np.array(latencies) * 1000
+    return requests / elapsed, np.percentile(ms, 50), np.percentile(ms, 95), batcher.get_stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translation micro-batching: throughput and latency per batch window (run as: python -m tests.bench_translation_batch)")
+    parser.add_argument("--target", default="en")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=20.0, help="Arrivals per second, e.g. several sessions or a backlog")
+    parser.add_argument("--windows", default="0,2,5,10,20", help="Batch windows in ms; 0 runs one request per call")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--device", default=None)
+    args = parser.parse_args()
+
+    languages = Languages().languages
+    translator = Translator(languages, args.target, device=args.device)
+    sources = [lang for lang in SENTENCES if lang != args.target]
+    for source in sources:
+        translator.translate_batch(SENTENCES[source][:2], source)  # Load and warm each model
+
+    print(f"\n=== Translation micro-batching ({args.requests} requests at {args.rate}/s, "
+          f"{'+'.join(sources)} -> {args.target}, device {translator.device}) ===\n")
+    for window_ms in [float(w) for w in args.windows.split(",")]:
+        max_batch = args.max_batch if window_ms > 0 else 1
+        throughput, p50, p95, stats = run_load(translator, sources, args.requests, args.rate, window_ms, max_batch)
+        print(f"  window {window_ms:5.1f} ms: {throughput:6.1f} req/s, p50 {p50:7.0f} ms, p95 {p95:7.0f} ms, "
+              f"avg batch {stats['avg_batch']}")
@@ -0,0 +1,82 @@
+import argparse
+import time
+import wave
+
+import numpy as np
+import torch
+
+from stt.silero_stream import StreamingSileroVAD
+from stt.cascade_vad import CascadeVAD
+from stt.vad_loader import load_silero_vad
+from utils.config import AudioConfig
+
+RATE = 16000
+CHUNK_SIZE = 480  # 30 ms, same as AudioConfig
+WINDOW_SIZE = int(1.5 * RATE)
+
+
+def load_audio(path=None, seconds=30):
+    """Load a 16 kHz mono int16 WAV, or synthesize speech-like bursts over noise."""
+    if path:
+        with wave.open(path, 'rb') as wf:
+            return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 300, seconds * RATE)
+    t = np.arange(RATE) / RATE
+    for start in range(2, seconds - 1, 5):
+        burst = 6000 * np.sin(2 * np.pi * 220 * t) * np.sin(2 * np.pi * 3 * t) ** 2
+        audio[start * RATE:(start + 1) * RATE] += burst
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+
+def bench_window(model, get_speech_timestamps, audio):
+    """Old path: run get_speech_timestamps over the last 1.5 s on every 30 ms chunk."""
+    start = time.process_time()
+    for end in range(WINDOW_SIZE, len(audio) + 1, CHUNK_SIZE):
+        window = torch.from_numpy(audio[end - WINDOW_SIZE:end].astype(np.float32))
+        get_speech_timestamps(window, model, sampling_rate=RATE)
+    return time.process_time() - start
+
+
+def bench_streaming(model, audio):
+    """New path: each 512-sample frame goes through the stateful model once."""
+    vad = StreamingSileroVAD(model, sample_rate=RATE)
+    start = time.process_time()
+    for pos in range(0, len(audio) - CHUNK_SIZE + 1, CHUNK_SIZE):
+        vad.update(audio[pos:pos + CHUNK_SIZE])
+    return time.process_time() - start
+
+
+def bench_cascade(model, audio):
+    """Cascade path: webrtcvad/energy gate first, Silero only where it may be speech."""
+    vad = CascadeVAD(StreamingSileroVAD(model, sample_rate=RATE), AudioConfig())
+    start = time.process_time()
+    for pos in range(0, len(audio) - CHUNK_SIZE + 1, CHUNK_SIZE):
+        vad.update(audio[pos:pos + CHUNK_SIZE])
+    return time.process_time() - start, vad.get_stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Silero-VAD CPU time per second of audio (run as: python -m tests.bench_vad)")
+    parser.add_argument("--wav", help="16 kHz mono int16 WAV file (default: synthetic)")
+    parser.add_argument("--seconds", type=int, default=30)
+    args = parser.parse_args()
+
+    torch.set_num_threads(1)
+    model, get_speech_timestamps = load_silero_vad("torch")
+    audio = load_audio(args.wav, args.seconds)
+    duration = len(audio) / RATE
+
+    print(f"\n=== VAD benchmark ({duration:.1f}s of audio) ===\n")
+    window_cpu = bench_window(model, get_speech_timestamps, audio)
+    model.reset_states()
+    stream_cpu = bench_streaming(model, audio)
+    model.reset_states()
+    cascade_cpu, cascade_stats = bench_cascade(model, audio)
+
+    print(f"  1.5s window re-scan: {window_cpu / duration * 1000:.1f} ms CPU per audio second")
+    print(f"  Streaming frames:    {stream_cpu / duration * 1000:.1f} ms CPU per audio second")
+    print(f"  Cascade (webrtcvad): {cascade_cpu / duration * 1000:.1f} ms CPU per audio second {cascade_stats}")
+    if stream_cpu > 0:
+        print(f"  Speed-up: {window_cpu / stream_cpu:.1f}x")
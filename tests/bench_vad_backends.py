@@ -0,0 +1,39 @@
+import time
+
+import numpy as np
+import torch
+
+from stt.vad_loader import MODEL_FILES, load_silero_vad
+
+RATE = 16000
+FRAME_SIZE = 512
+
+
+def bench_backend(backend, n_frames=2000):
+    """Return (load seconds, per-frame latencies in seconds) for one backend."""
+    start = time.perf_counter()
+    model, _ = load_silero_vad(backend)
+    load_time = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    frames = rng.normal(0, 0.05, (n_frames, FRAME_SIZE)).astype(np.float32)
+    latencies = []
+    with torch.no_grad():
+        for frame in frames:
+            t0 = time.perf_counter()
+            model(torch.from_numpy(frame), RATE).item()
+            latencies.append(time.perf_counter() - t0)
+    return load_time, np.array(latencies)
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    print("\n=== Silero-VAD backend benchmark (run as: python -m tests.bench_vad_backends) ===\n")
+    for backend in MODEL_FILES:
+        try:
+            load_time, latencies = bench_backend(backend)
+        except Exception as e:
+            print(f"  {backend}: skipped ({e})")
+            continue
+        print(f"  {backend:5s} startup {load_time * 1000:7.1f} ms | per frame "
+              f"mean {latencies.mean() * 1e6:6.0f} us, p95 {np.percentile(latencies, 95) * 1e6:6.0f} us")
@@ -0,0 +1,56 @@
+import argparse
+import time
+import wave
+
+import numpy as np
+
+from stt.whisper_transcriber import WhisperTranscriber
+
+RATE = 16000
+
+
+def load_segments(path=None, segment_seconds=4.0, count=16):
+    """Cut a 16 kHz mono int16 WAV into equal segments, or synthesize voiced bursts."""
+    size = int(segment_seconds * RATE)
+    if path:
+        with wave.open(path, 'rb') as wf:
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return [audio[pos:pos + size].tobytes() for pos in range(0, len(audio) - size + 1, size)][:count]
+
+    rng = np.random.default_rng(0)
+    t = np.arange(size) / RATE
+    segments = []
+    for k in range(count):
+        f0 = 120 + 10 * k
+        voiced = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 5)) * np.sin(2 * np.pi * 2 * t) ** 2
+        audio = 5000 * voiced + rng.normal(0, 200, size)
+        segments.append(np.clip(audio, -32768, 32767).astype(np.int16).tobytes())
+    return segments
+
+
+def bench(transcriber, segments, batch_size):
+    """Wall time to transcribe all segments in batches of batch_size."""
+    start = time.perf_counter()
+    for pos in range(0, len(segments), batch_size):
+        transcriber.transcribe_batch(segments[pos:pos + batch_size])
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched Whisper throughput on CPU int8 (run as: python -m tests.bench_whisper_batch)")
+    parser.add_argument("--wav", help="16 kHz mono int16 WAV with speech (default: synthetic, not representative of WER)")
+    parser.add_argument("--segments", type=int, default=16)
+    parser.add_argument("--segment-seconds", type=float, default=4.0)
+    parser.add_argument("--batch-sizes", default="1,4,8")
+    args = parser.parse_args()
+
+    transcriber = WhisperTranscriber(device="cpu", compute_type="int8")
+    segments = load_segments(args.wav, args.segment_seconds, args.segments)
+    audio_seconds = sum(len(segment) for segment in segments) / 2 / RATE
+
+    print(f"\n=== Whisper batch benchmark ({len(segments)} segments, {audio_seconds:.0f}s of audio) ===\n")
+    transcriber.transcribe_batch(segments[:1])  # Warm-up
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        elapsed = bench(transcriber, segments, batch_size)
+        print(f"  batch {batch_size}: {len(segments) / elapsed:.2f} segments/s, "
+              f"RTF {elapsed / audio_seconds:.3f}, {elapsed:.1f}s total")
@@ -0,0 +1,38 @@
+import argparse
+import os
+import time
+
+from stt.whisper_pool import WhisperWorkerPool
+from tests.bench_whisper_batch import RATE, load_segments
+
+
+def bench(num_workers, cpu_threads, segments, profile):
+    """Wall time for a backlog of segments through a pool of num_workers processes."""
+    pool = WhisperWorkerPool(num_workers, cpu_threads, profile)
+    pool.map(segments[:num_workers])  # Wait for every worker to load its model
+    start = time.perf_counter()
+    pool.map(segments)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Whisper worker pool scaling on CPU (run as: python -m tests.bench_whisper_pool)")
+    parser.add_argument("--wav", help="16 kHz mono int16 WAV with speech (default: synthetic)")
+    parser.add_argument("--segments", type=int, default=16)
+    parser.add_argument("--cpu-threads", type=int, default=2)
+    parser.add_argument("--profile", default="realtime")
+    parser.add_argument("--workers", default=f"1,2,{max(1, os.cpu_count() // 2)}")
+    args = parser.parse_args()
+
+    segments = load_segments(args.wav, count=args.segments)
+    audio_seconds = sum(len(segment) for segment in segments) / 2 / RATE
+
+    print(f"\n=== Whisper pool benchmark ({len(segments)} segments, {audio_seconds:.0f}s of audio, {os.cpu_count()} cores) ===\n")
+    baseline = None
+    for num_workers in sorted({int(n) for n in args.workers.split(",")}):
+        elapsed = bench(num_workers, args.cpu_threads, segments, args.profile)
+        baseline = baseline or elapsed
+        print(f"  {num_workers} workers x {args.cpu_threads} threads: {len(segments) / elapsed:.2f} segments/s, "
+              f"RTF {elapsed / audio_seconds:.3f}, speed-up {baseline / elapsed:.2f}x")
@@ -0,0 +1,73 @@
+import argparse
+import csv
+import os
+import re
+import time
+import wave
+
+import numpy as np
+
+from stt.whisper_transcriber import WhisperTranscriber
+
+RATE = 16000
+
+
+def load_manifest(path):
+    """Read a CSV of `wav_path,reference text` rows (paths relative to the CSV)."""
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or row[0].startswith("#"):
+                continue
+            with wave.open(os.path.join(base, row[0]), 'rb') as wf:
+                audio = wf.readframes(wf.getnframes())
+            items.append((audio, row[1]))
+    return items
+
+
+def normalize(text):
+    return re.sub(r"[^\w']+", " ", (text or "").lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)."""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    row = np.arange(len(hyp) + 1)
+    for i, ref_word in enumerate(ref, 1):
+        prev, row = row, np.empty_like(row)
+        row[0] = i
+        for j, hyp_word in enumerate(hyp, 1):
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (ref_word != hyp_word))
+    return int(row[-1]), len(ref)
+
+
+def bench_profile(transcriber, items, profile):
+    """Returns (real-time factor, word error rate) over the whole set."""
+    transcriber.transcribe(items[0][0], profile=profile)  # Load and warm up the profile's model
+    elapsed, errors, words = 0.0, 0, 0
+    for audio, reference in items:
+        start = time.perf_counter()
+        text, _ = transcriber.transcribe(audio, profile=profile)
+        elapsed += time.perf_counter() - start
+        e, n = word_errors(reference, text)
+        errors += e
+        words += n
+    audio_seconds = sum(len(audio) for audio, _ in items) / 2 / RATE
+    return elapsed / audio_seconds, errors / max(words, 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RTF and WER per Whisper decoding profile (run as: python -m tests.bench_whisper_profiles)")
+    parser.add_argument("manifest", help="CSV with `wav_path,reference text` rows; 16 kHz mono int16 WAVs")
+    parser.add_argument("--profiles", default="realtime,balanced,accurate")
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    items = load_manifest(args.manifest)
+    transcriber = WhisperTranscriber(device=args.device, profile=args.profiles.split(",")[0])
+
+    print(f"\n=== Whisper profile benchmark ({len(items)} utterances, {args.device}) ===\n")
+    for profile in args.profiles.split(","):
+        rtf, wer = bench_profile(transcriber, items, profile)
+        print(f"  {profile:<10} RTF {rtf:.3f}   WER {wer * 100:.1f}%")
@@ -0,0 +1,50 @@
+import argparse
+import time
+
+from mcp.mcp2 import ConversationContext
+from mcp.whisper_prompt import WhisperPromptBuilder
+from stt.whisper_transcriber import WhisperTranscriber
+from tests.bench_whisper_profiles import load_manifest, word_errors
+
+
+def run_conversation(transcriber, items, profile, use_prompt, topics=()):
+    """Transcribe the manifest in order as one conversation; returns fallbacks, WER and time."""
+    context = ConversationContext(max_history=100)
+    context.topics.update(topics)
+    builder = WhisperPromptBuilder(context, count_tokens=transcriber.count_tokens)
+    transcriber.prompt_source = builder.build if use_prompt else None
+    transcriber.decode_stats = {"segments": 0, "fallbacks": 0}
+    if transcriber.language_tracker:
+        transcriber.language_tracker.reset()
+
+    errors, words, elapsed = 0, 0, 0.0
+    for audio, reference in items:
+        start = time.perf_counter()
+        text, lang = transcriber.transcribe(audio, profile=profile)
+        elapsed += time.perf_counter() - start
+        e, n = word_errors(reference, text)
+        errors, words = errors + e, words + n
+        if text:
+            context.add_exchange(text, lang or "en", text, lang or "en")
+    return transcriber.decode_stats["fallbacks"], errors / max(words, 1), elapsed, builder.get_stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Whisper fallback re-decodes with and without context prompting (run as: python -m tests.bench_whisper_prompt)")
+    parser.add_argument("manifest", help="CSV with `wav_path,reference text` rows, in conversation order")
+    parser.add_argument("--profile", default="balanced", help="Needs temperature fallback to count retries")
+    parser.add_argument("--topics", default="", help="Comma-separated domain terms to seed the topic list")
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    items = load_manifest(args.manifest)
+    transcriber = WhisperTranscriber(device=args.device, profile=args.profile)
+    topics = [topic.strip() for topic in args.topics.split(",") if topic.strip()]
+    transcriber.transcribe(items[0][0])  # Warm-up
+
+    print(f"\n=== Whisper context prompting benchmark ({len(items)} utterances, profile {args.profile}) ===\n")
+    for use_prompt in (False, True):
+        fallbacks, wer, elapsed, builder_stats = run_conversation(transcriber, items, args.profile, use_prompt, topics)
+        label = "with prompt" if use_prompt else "cold      "
+        print(f"  {label}: {fallbacks} fallbacks, WER {wer * 100:.1f}%, {elapsed:.1f}s"
+              + (f", prompt cache {builder_stats}" if use_prompt else ""))
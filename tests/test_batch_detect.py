@@ -0,0 +1,39 @@
+import json
+
+from language_detection.batch_detect import detect_batch, label_file, relabel_history
+
+LINES = ["Muchas gracias.", "See you tomorrow.", "12345", "Je ne suis pas sûr.", "¿Dónde está la estación?"]
+
+
+def test_detect_batch_keeps_order_and_leaves_unscored_lines_unlabelled():
+    results = list(detect_batch(LINES, chunk_size=2))
+    assert [text for text, _, _ in results] == LINES
+    assert [language for _, language, _ in results] == ["es", "en", None, "fr", "es"]
+
+
+def test_worker_processes_match_in_process_results():
+    assert list(detect_batch(LINES, workers=2, chunk_size=2)) == list(detect_batch(LINES, chunk_size=2))
+
+
+def test_label_file_writes_one_row_per_line(tmp_path):
+    source = tmp_path / "transcript.txt"
+    source.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    out = tmp_path / "labels.tsv"
+    counts = label_file(str(source), str(out))
+
+    rows = [line.split("\t") for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row[2] for row in rows] == LINES
+    assert rows[2][0] == "-"
+    assert counts == {"es": 2, "en": 1, None: 1, "fr": 1}
+
+
+def test_relabel_history_keeps_recorded_language_when_unsure(tmp_path):
+    path = tmp_path / "conversation_history.json"
+    history = [{"original": "Muchas gracias.", "source_lang": "en"},
+               {"original": "123", "source_lang": "fr"},
+               {"original": "See you tomorrow.", "source_lang": "en"}]
+    path.write_text(json.dumps({"history": history}), encoding="utf-8")
+
+    assert relabel_history(str(path)) == 1
+    relabelled = json.loads(path.read_text(encoding="utf-8"))["history"]
+    assert [exchange["source_lang"] for exchange in relabelled] == ["es", "fr", "en"]
@@ -0,0 +1,44 @@
+from stt.confidence_gate import ConfidenceGate
+
+
+class GateConfig:
+    """WhisperConfig stand-in with the gate thresholds only."""
+    GATE_NO_SPEECH_PROB = 0.6
+    GATE_DROP_LOGPROB = -1.0
+    GATE_HOLD_LOGPROB = -0.8
+    GATE_MAX_COMPRESSION = 2.4
+
+
+def _confidence(avg_logprob=-0.2, no_speech_prob=0.1, compression_ratio=1.2):
+    return {"avg_logprob": avg_logprob, "no_speech_prob": no_speech_prob, "compression_ratio": compression_ratio}
+
+
+def test_hallucination_dropped_only_when_decode_looks_like_silence():
+    gate = ConfidenceGate(GateConfig())
+    assert gate.classify("Thank you.", "en", _confidence(no_speech_prob=0.9)) == ("drop", "hallucination")
+    assert gate.classify("Thank you.", "en", _confidence()) == ("pass", None)
+    assert gate.classify("Merci beaucoup !", "fr", _confidence(avg_logprob=-1.5)) == ("drop", "hallucination")
+
+
+def test_repetition_loop_and_compression_are_dropped():
+    gate = ConfidenceGate(GateConfig())
+    assert gate.classify("go go go go go", "en", _confidence())[1] == "repetition"
+    assert gate.classify("The plan is fine.", "en", _confidence(compression_ratio=3.0)) == ("drop", "compression")
+
+
+def test_low_confidence_text_is_held_and_released_with_next_segment():
+    gate = ConfidenceGate(GateConfig())
+    assert gate.filter("so I was", "en", _confidence(avg_logprob=-0.9), utterance_id=1, final=False) is None
+    assert gate.filter("thinking about it", "en", _confidence(), utterance_id=1, final=True) == \
+        "so I was thinking about it"
+    stats = gate.get_stats()
+    assert stats["held"] == 1 and stats["released"] == 1 and stats["saved_segments"] == 0
+
+
+def test_held_text_expires_at_end_of_utterance():
+    gate = ConfidenceGate(GateConfig())
+    gate.filter("mumble", "en", _confidence(avg_logprob=-0.9), utterance_id=1, final=False)
+    assert gate.filter("Hello there.", "en", _confidence(), utterance_id=2, final=True) == "Hello there."
+    gate.filter("mumble", "en", _confidence(avg_logprob=-0.9), utterance_id=3, final=True)
+    stats = gate.get_stats()
+    assert stats["expired"] == 2 and stats["saved_segments"] == 2
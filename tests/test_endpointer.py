@@ -0,0 +1,95 @@
+import queue
+
+import numpy as np
+
+from stt.endpointer import Endpointer
+
+CHUNK = 480  # 30 ms at 16 kHz
+
+
+class EndpointConfig:
+    """AudioConfig stand-in with the endpointing settings only."""
+    RATE = 16000
+    CHUNK_DURATION_MS = 30
+    CHUNK_SIZE = CHUNK
+    MIN_AUDIO_CHUNKS = 15
+    MAX_AUDIO_CHUNKS = 200
+    ENDPOINT_EARLY_EMIT = False
+    ENDPOINT_PARTIAL_PAUSE_MS = 180
+    ENDPOINT_MIN_PARTIAL_MS = 1000
+    SEGMENT_OVERLAP_MS = 500
+    SEGMENT_CUT_SEARCH_MS = 2000
+    STREAMING_ASR = False
+    STREAMING_ASR_INTERVAL_MS = 500
+
+
+def _endpointer(**overrides):
+    config = EndpointConfig()
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return Endpointer(config, queue.Queue())
+
+
+def _drain(endpointer):
+    segments = []
+    while not endpointer.audio_queue.empty():
+        segments.append(endpointer.audio_queue.get_nowait())
+    return segments
+
+
+def _chunk(value=1000):
+    return np.full(CHUNK, value, dtype=np.int16)
+
+
+def test_utterance_includes_pre_roll():
+    endpointer = _endpointer()
+    for _ in range(5):
+        endpointer.process(_chunk(0), speech_active=False)
+    for _ in range(20):
+        endpointer.process(_chunk(), speech_active=True)
+    endpointer.process(_chunk(0), speech_active=False)
+
+    [segment] = _drain(endpointer)
+    assert segment.final and segment.utterance_id == 1
+    assert len(segment) == 25 * CHUNK * 2  # 5 silent pre-roll chunks + 20 speech chunks, int16
+
+
+def test_too_short_utterance_is_dropped():
+    endpointer = _endpointer()
+    for _ in range(3):
+        endpointer.process(_chunk(), speech_active=True)
+    endpointer.process(_chunk(0), speech_active=False)
+    assert _drain(endpointer) == []
+
+
+def test_early_emit_sends_partial_at_pause_then_end_marker():
+    endpointer = _endpointer(ENDPOINT_EARLY_EMIT=True)
+    for _ in range(40):
+        endpointer.process(_chunk(), speech_active=True)
+    for _ in range(6):  # 180 ms pause while VAD still reports speech
+        endpointer.process(_chunk(0), speech_active=True, is_pause=True)
+    endpointer.process(_chunk(0), speech_active=False)
+
+    partial, final = _drain(endpointer)
+    assert not partial.final and len(partial) == 46 * CHUNK * 2
+    assert final.final and len(final) == 0  # Tail shorter than the minimum only marks the end
+    assert partial.utterance_id == final.utterance_id
+
+
+def test_long_speech_splits_at_quiet_point_with_overlap():
+    endpointer = _endpointer()
+    rng = np.random.default_rng(0)
+    signal = rng.integers(-3000, 3000, size=210 * CHUNK).astype(np.int16)
+    signal[80000:80160] = 0  # One quiet 10 ms frame inside the cut search region
+    for i in range(210):
+        endpointer.process(signal[i * CHUNK:(i + 1) * CHUNK], speech_active=True)
+    endpointer.flush()
+
+    partial, final = _drain(endpointer)
+    assert not partial.final and final.final
+    partial_audio = np.frombuffer(partial, dtype=np.int16)
+    final_audio = np.frombuffer(final, dtype=np.int16)
+    assert len(partial_audio) == 80080  # Middle of the quiet frame
+    assert final.overlap_samples == 8000
+    np.testing.assert_array_equal(final_audio[:8000], partial_audio[-8000:])
+    np.testing.assert_array_equal(np.concatenate([partial_audio, final_audio[8000:]]), signal)
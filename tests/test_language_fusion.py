@@ -0,0 +1,47 @@
+from language_detection.language_fusion import LanguageDecider
+
+
+class FixedScores:
+    """Text detector stand-in returning fixed scores."""
+
+    def __init__(self, scores):
+        self.scores_by_text = scores
+        self.calls = 0
+
+    def scores(self, text):
+        self.calls += 1
+        return self.scores_by_text.get(text, {})
+
+
+def _decider(scores=None):
+    return LanguageDecider(["en", "es", "fr"], FixedScores(scores or {}))
+
+
+def test_confident_whisper_skips_text_detector():
+    decider = _decider({"hola": {"es": 1.0}})
+    assert decider.decide("hola", None, {"en": 0.95, "es": 0.05}) == "en"
+    assert decider.text_detector.calls == 0
+    assert decider.paths["whisper"] == 1
+
+
+def test_no_text_scores_leaves_text_term_out():
+    decider = _decider()
+    decider.prior = {"en": 0.4, "es": 0.3, "fr": 0.3}
+    # prior x Whisper favours French (0.15 vs 0.14); counting the prior twice would pick English
+    assert decider.decide("?!", None, {"en": 0.35, "es": 0.15, "fr": 0.5}) == "fr"
+
+
+def test_no_evidence_keeps_prior_unchanged():
+    decider = _decider()
+    decider.prior = {"en": 0.2, "es": 0.6, "fr": 0.2}
+    assert decider.decide("", None, None) == "es"
+    assert decider.prior == {"en": 0.2, "es": 0.6, "fr": 0.2}
+    assert decider.paths["prior"] == 1
+
+
+def test_short_text_scores_are_cached():
+    decider = _decider({"merci": {"fr": 0.9, "en": 0.05, "es": 0.05}})
+    for _ in range(3):
+        assert decider.decide("merci", None, {"en": 0.3, "fr": 0.4, "es": 0.3}) == "fr"
+    assert decider.text_detector.calls == 1
+    assert decider.paths["cache"] == 2
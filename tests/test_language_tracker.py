@@ -0,0 +1,50 @@
+from language_detection.language_tracker import LanguageTracker
+
+
+def _tracker():
+    return LanguageTracker(["en", "es", "fr"], stable_segments=3, min_probability=0.8, min_logprob=-0.8,
+                           recheck_every=4)
+
+
+def test_locks_after_stable_confident_detections():
+    tracker = _tracker()
+    tracker.update("es", 0.95)
+    tracker.update("es", 0.6)  # Not confident: neither counts nor breaks the streak
+    tracker.update("es", 0.9)
+    assert tracker.language_hint() is None
+    tracker.update("es", 0.9)
+    assert tracker.language_hint() == "es"
+
+
+def test_unsupported_language_never_locks():
+    tracker = _tracker()
+    for _ in range(5):
+        tracker.update("de", 0.99)
+    assert tracker.language_hint() is None
+
+
+def test_poor_forced_decode_triggers_recheck():
+    tracker = _tracker()
+    for _ in range(3):
+        tracker.update("en", 0.9)
+    tracker.update("en", avg_logprob=-0.3, forced=True)
+    assert tracker.language_hint() == "en"
+    tracker.update("en", avg_logprob=-1.2, forced=True)
+    assert tracker.language_hint() is None
+
+
+def test_periodic_recheck_and_switch():
+    tracker = _tracker()
+    for _ in range(3):
+        tracker.update("en", 0.9)
+    for _ in range(4):
+        tracker.update("en", avg_logprob=-0.3, forced=True)
+    assert tracker.language_hint() is None  # recheck_every locked segments reached
+
+    tracker.update("fr", 0.95)  # The recheck finds another language: the lock is dropped
+    assert tracker.language_hint() is None
+    tracker.update("fr", 0.95)
+    tracker.update("fr", 0.95)
+    assert tracker.language_hint() == "fr"
+    stats = tracker.get_stats()
+    assert stats["switches"] == 1 and stats["language_id_skipped"] == 4
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from translation.micro_batcher import TranslationBatcher
+
+
+class RecordingTranslate:
+    """translate_batch stand-in that upper-cases texts and records each call."""
+
+    def __init__(self, drop_last=False, error=None):
+        self.calls = []
+        self.drop_last = drop_last
+        self.error = error
+        self.lock = threading.Lock()
+
+    def __call__(self, texts, source_lang, target_lang):
+        with self.lock:
+            self.calls.append((list(texts), source_lang, target_lang))
+        if self.error:
+            raise self.error
+        results = [text.upper() for text in texts]
+        return results[:-1] if self.drop_last else results
+
+
+def _run(translate, requests, max_batch=8, window_ms=50):
+    batcher = TranslationBatcher(translate, max_batch, window_ms)
+    futures = [batcher.submit(text, source, target) for text, source, target in requests]
+    for future in futures:
+        future.exception(timeout=1)  # Wait for the window to run the batches
+    batcher.close()
+    return futures, batcher
+
+
+def test_results_resolve_per_request_and_batch_per_pair():
+    translate = RecordingTranslate()
+    futures, batcher = _run(translate, [("hola", "es", "en"), ("salut", "fr", "en"), ("adiós", "es", "en")])
+    assert [future.result(timeout=1) for future in futures] == ["HOLA", "SALUT", "ADIÓS"]
+    assert sorted(call[1] for call in translate.calls) == ["es", "fr"]
+    assert batcher.get_stats()["requests"] == 3
+
+
+def test_max_batch_splits_large_backlog():
+    translate = RecordingTranslate()
+    futures, batcher = _run(translate, [(str(i), "es", "en") for i in range(5)], max_batch=2)
+    assert [future.result(timeout=1) for future in futures] == [str(i) for i in range(5)]
+    assert batcher.get_stats()["largest_batch"] == 2
+
+
+def test_short_result_fails_every_future_in_the_batch():
+    futures, _ = _run(RecordingTranslate(drop_last=True), [("a", "es", "en"), ("b", "es", "en")])
+    for future in futures:
+        with pytest.raises(RuntimeError, match="returned 1 results for 2 texts"):
+            future.result(timeout=1)
+
+
+def test_translate_error_is_set_on_every_future():
+    futures, _ = _run(RecordingTranslate(error=ValueError("model missing")), [("a", "es", "en"), ("b", "es", "en")])
+    for future in futures:
+        with pytest.raises(ValueError, match="model missing"):
+            future.result(timeout=1)
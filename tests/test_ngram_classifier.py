@@ -0,0 +1,49 @@
+import pytest
+
+from language_detection.ngram_classifier import NgramLanguageClassifier, extract_ngrams, extract_words
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return NgramLanguageClassifier(["en", "es", "fr"])
+
+
+@pytest.mark.parametrize("language, text", [
+    ("en", "Where is the station?"), ("en", "I don't think so."), ("en", "Let me check."),
+    ("es", "¿Qué hora es?"), ("es", "Muchas gracias."), ("es", "No estoy seguro."),
+    ("fr", "Merci beaucoup."), ("fr", "Où est la gare ?"), ("fr", "Je ne suis pas sûr."),
+])
+def test_short_utterances(classifier, language, text):
+    assert classifier.classify(text)[0] == language
+
+
+def test_inverted_marks_are_spanish_words_not_ngrams():
+    assert extract_words("¿Sí?") == ["¿", "sí"]
+    assert all("¿" not in gram for gram in extract_ngrams("¿Sí?"))
+
+
+def test_abstains_below_confidence_floor():
+    strict = NgramLanguageClassifier(["en", "es", "fr"], min_confidence=0.99)
+    language, probability = strict.classify("merci")
+    assert language is None and 0.0 < probability < 0.99
+
+
+def test_text_without_letters_has_no_scores(classifier):
+    assert classifier.scores("123 ?!") == {}
+    assert classifier.classify("123 ?!") == (None, 0.0)
+
+
+def test_classify_batch_matches_classify(classifier):
+    texts = ["Hasta mañana.", "", "See you tomorrow.", "42", "Il se fait tard.", "merci"]
+    batch = classifier.classify_batch(texts)
+    for text, (language, probability) in zip(texts, batch):
+        expected_language, expected_probability = classifier.classify(text)
+        assert language == expected_language
+        assert probability == pytest.approx(expected_probability, abs=1e-5)
+
+
+def test_only_configured_languages_are_scored():
+    two = NgramLanguageClassifier(["en", "fr"])
+    assert set(two.scores("Hola amigo")) == {"en", "fr"}
+    with pytest.raises(ValueError):
+        NgramLanguageClassifier(["de"])
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from stt.ring_buffer import RingBuffer, SPSCRingBuffer, SampleBuffer
+
+
+def test_ring_buffer_keeps_newest_samples_contiguous():
+    ring = RingBuffer(8)
+    ring.append(np.arange(5))
+    ring.append(np.arange(5, 11))  # Wraps: 0..2 are overwritten
+    assert len(ring) == 8
+    np.testing.assert_array_equal(ring.latest(), np.arange(3, 11))
+    np.testing.assert_array_equal(ring.latest(3), [8, 9, 10])
+
+
+def test_ring_buffer_append_larger_than_capacity_keeps_tail():
+    ring = RingBuffer(4)
+    ring.append(np.arange(2))
+    ring.append(np.arange(10))
+    np.testing.assert_array_equal(ring.latest(), [6, 7, 8, 9])
+    ring.clear()
+    assert len(ring) == 0
+    assert len(ring.latest()) == 0
+
+
+def test_sample_buffer_overflow_raises():
+    buffer = SampleBuffer(4)
+    buffer.append(np.array([1, 2, 3]))
+    with pytest.raises(ValueError):
+        buffer.append(np.array([4, 5]))
+    np.testing.assert_array_equal(buffer.view(), [1, 2, 3])
+    assert not buffer.view().flags.writeable  # Callers copy before handing it to torch
+
+
+def test_spsc_ring_buffer_wraps_and_reports_short_reads():
+    ring = SPSCRingBuffer(5)
+    assert ring.write(np.arange(4)) == 4
+    np.testing.assert_array_equal(ring.read(3), [0, 1, 2])
+    assert ring.write(np.arange(4, 10)) == 4  # Only 4 free slots; the write wraps
+    assert ring.read(6) is None
+    np.testing.assert_array_equal(ring.read(5), [3, 4, 5, 6, 7])
+    assert len(ring) == 0
+
+
+def test_spsc_ring_buffer_read_returns_copy():
+    ring = SPSCRingBuffer(4)
+    ring.write(np.array([1, 2]))
+    out = ring.read(2)
+    ring.write(np.array([7, 7, 7, 7]))
+    np.testing.assert_array_equal(out, [1, 2])
@@ -0,0 +1,23 @@
+from stt.stitch import stitch_overlap
+
+
+def test_repeated_words_are_dropped():
+    assert stitch_overlap("I went to the store and", "the store and bought milk") == "bought milk"
+
+
+def test_repeat_may_end_before_previous_segment_end():
+    assert stitch_overlap("send the report to me", "the report was late") == "was late"
+
+
+def test_matching_ignores_case_and_punctuation():
+    assert stitch_overlap("See you tomorrow.", "Tomorrow, then") == "then"
+
+
+def test_single_short_word_is_not_stitched():
+    assert stitch_overlap("I saw the", "the cat") == "the cat"
+
+
+def test_no_overlap_or_no_previous_text_is_unchanged():
+    assert stitch_overlap("Hello there", "how are you") == "how are you"
+    assert stitch_overlap("", "how are you") == "how are you"
+    assert stitch_overlap(None, "how are you") == "how are you"
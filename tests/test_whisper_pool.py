@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from stt import whisper_pool
+from stt.whisper_pool import WhisperWorkerPool
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                                reason="the stand-in workers are patched in and need fork")
+
+
+def _echo_worker(index, task_queue, result_queue, current, profile, cpu_threads):
+    """Worker stand-in: reports the segment's length and sum instead of transcribing it."""
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        seq, shm_name, n_samples, _ = task
+        current[index] = seq
+        shm = whisper_pool._attach(shm_name)
+        samples = np.ndarray((n_samples,), dtype=np.int16, buffer=shm.buf)
+        result = (f"{n_samples}:{int(samples.sum())}", "en", None)
+        del samples
+        shm.close()
+        current[index] = -1
+        result_queue.put((seq, index, result, {"worker": index}))
+
+
+def _crash_worker(index, task_queue, result_queue, current, profile, cpu_threads):
+    """Worker stand-in that dies in the middle of its first segment."""
+    seq = task_queue.get()[0]
+    current[index] = seq
+    os._exit(3)
+
+
+def _pool(monkeypatch, worker, num_workers=2):
+    monkeypatch.setattr(whisper_pool, "_worker_main", worker)
+    return WhisperWorkerPool(num_workers, cpu_threads=1)
+
+
+def test_results_come_back_per_segment(monkeypatch):
+    pool = _pool(monkeypatch, _echo_worker)
+    try:
+        segments = [np.full(n, 2, dtype=np.int16).tobytes() for n in (10, 400, 3)]
+        assert [text for text, _, _ in pool.map(segments)] == ["10:20", "400:800", "3:6"]
+        assert pool.get_stats()["in_flight"] == 0
+    finally:
+        pool.close()
+
+
+def test_dead_worker_fails_its_segment_and_stops_the_pool(monkeypatch):
+    pool = _pool(monkeypatch, _crash_worker, num_workers=1)
+    try:
+        future = pool.submit(np.zeros(16, dtype=np.int16).tobytes())
+        with pytest.raises(RuntimeError, match="exited"):
+            future.result(timeout=10)
+        assert pool.get_stats()["failed"]
+        with pytest.raises(RuntimeError, match="stopped"):
+            pool.submit(np.zeros(16, dtype=np.int16).tobytes())
+    finally:
+        pool.close()
+
+
+def test_pending_segments_fail_when_the_pool_stops(monkeypatch):
+    pool = _pool(monkeypatch, _crash_worker, num_workers=1)
+    try:
+        futures = [pool.submit(np.zeros(16, dtype=np.int16).tobytes()) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=10)
+        assert pool.get_stats()["in_flight"] == 0
+    finally:
+        pool.close()
@@ -0,0 +1,113 @@
+import gc
+import threading
+import time
+from collections import OrderedDict
+
+import torch
+from transformers import MarianMTModel, MarianTokenizer
+
+from utils.config import TranslationConfig
+
+
+class MarianRegistry:
+    """Owns every MarianMT model in the process, each loaded once on first use.
+
+    All Translator instances share one registry, so a pair used by several
+    targets or pipelines is held once. When the loaded models exceed the
+    memory budget, the least recently used ones are unloaded; a Translator
+    in the middle of a call keeps its own reference until it finishes.
+    """
+
+    def __init__(self, memory_budget_mb=None):
+        self.memory_budget_mb = memory_budget_mb
+        self.models = OrderedDict()  # (model_name, device) -> {"model", "tokenizer", "mb"}
+        self.failed = set()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0, "load_s": 0.0}
+
+    def get(self, model_name, device):
+        """{"model", "tokenizer"} for model_name on device, loading it if needed; None if it cannot load."""
+        key = (model_name, device)
+        entry = self._lookup(key)
+        if entry or key in self.failed:
+            return entry
+
+        # One load at a time; calls for models already loaded do not wait for it
+        with self._load_lock:
+            entry = self._lookup(key)
+            if entry or key in self.failed:
+                return entry
+
+            print(f"Loading translation model {model_name} on {device}...")
+            start = time.perf_counter()
+            try:
+                tokenizer = MarianTokenizer.from_pretrained(model_name)
+                model = MarianMTModel.from_pretrained(model_name).to(device)
+                model.eval()
+            except Exception as e:
+                print(f"Failed to load model {model_name}: {str(e)}")
+                self.failed.add(key)
+                return None
+            elapsed = time.perf_counter() - start
+
+            size = sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+            entry = {"model": model, "tokenizer": tokenizer, "mb": size / 2 ** 20}
+            with self._lock:
+                self.models[key] = entry
+                self.stats["loads"] += 1
+                self.stats["load_s"] += elapsed
+                self._evict(keep=key)
+            print(f"{model_name} loaded in {elapsed:.1f}s ({entry['mb']:.0f} MB)")
+            return entry
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self.models.get(key)
+            if entry:
+                self.models.move_to_end(key)
+                self.stats["hits"] += 1
+            return entry
+
+    def _evict(self, keep):
+        """Unload least recently used models until the rest fit the budget."""
+        if self.memory_budget_mb is None:
+            return
+        evicted = False
+        while self.memory_mb() > self.memory_budget_mb and len(self.models) > 1:
+            key = next(k for k in self.models if k != keep)
+            del self.models[key]
+            self.stats["evictions"] += 1
+            evicted = True
+            print(f"Unloaded translation model {key[0]} (memory budget {self.memory_budget_mb} MB)")
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def memory_mb(self):
+        return sum(entry["mb"] for entry in self.models.values())
+
+    def get_stats(self):
+        return {
+            "loaded": [name for name, _ in self.models],
+            "memory_mb": round(self.memory_mb()),
+            "budget_mb": self.memory_budget_mb,
+            "hits": self.stats["hits"],
+            "loads": self.stats["loads"],
+            "evictions": self.stats["evictions"],
+            "load_s": round(self.stats["load_s"], 1)
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_marian_registry():
+    """The process-wide registry, created on first call from TranslationConfig."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MarianRegistry(TranslationConfig().MARIAN_MEMORY_BUDGET_MB)
+        return _registry
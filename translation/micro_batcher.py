@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class TranslationBatcher:
+    """Collects translation requests in the background and runs them as batches.
+
+    Requests are grouped per (source, target) pair. A pair's batch runs when
+    it reaches max_batch items or when its oldest request has waited
+    window_ms, whichever comes first; each request's Future then resolves
+    to its translation. translate_batch(texts, source_lang, target_lang)
+    does the actual work, e.g. Translator.translate_batch.
+    """
+
+    def __init__(self, translate_batch, max_batch=8, window_ms=5):
+        self.translate_batch = translate_batch
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.requests = queue.Queue()
+        self.pending = {}  # (source, target) -> [(text, future)], oldest first
+        self.deadlines = {}  # (source, target) -> time the pair's batch must run
+        self.running = True
+        self.stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+        self.thread = threading.Thread(target=self._run, name="TranslationBatcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, text, source_lang, target_lang):
+        """Queue one text; returns a Future of its translation."""
+        future = Future()
+        self.requests.put(((source_lang, target_lang), text, future))
+        return future
+
+    def _run(self):
+        while self.running or self.pending or not self.requests.empty():
+            timeout = max(min(self.deadlines.values()) - time.perf_counter(), 0) if self.deadlines else 0.1
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                request = None
+            if request:
+                pair, text, future = request
+                if pair not in self.pending:
+                    self.pending[pair] = []
+                    self.deadlines[pair] = time.perf_counter() + self.window
+                self.pending[pair].append((text, future))
+
+            now = time.perf_counter()
+            for pair in [p for p in self.pending
+                         if len(self.pending[p]) >= self.max_batch or self.deadlines[p] <= now or not self.running]:
+                self._flush(pair)
+
+    def _flush(self, pair):
+        items = self.pending.pop(pair)
+        del self.deadlines[pair]
+        for start in range(0, len(items), self.max_batch):
+            batch = items[start:start + self.max_batch]
+            try:
+                translations = list(self.translate_batch([text for text, _ in batch], *pair))
+                if len(translations) != len(batch):
+                    raise RuntimeError(f"translate_batch returned {len(translations)} results for {len(batch)} texts")
+                for (_, future), translation in zip(batch, translations):
+                    future.set_result(translation)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+
+    def close(self):
+        """Run whatever is still pending and stop the background thread."""
+        self.running = False
+        self.thread.join(timeout=5)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["avg_batch"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
@@ -2,24 +2,31 @@ import torch
 from transformers import MarianMTModel, MarianTokenizer
 import re
 from collections import deque
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import time
 from llm_langchain.use_llm import clean_text
+from translation.marian_registry import MarianRegistry, get_marian_registry
 
 class Translator:
     
-    def __init__(self, languages: Dict, target_lang: str, device: Optional[str] = None):
+    def __init__(self, languages: Dict, target_lang: str, device: Optional[str] = None,
+                 registry: Optional[MarianRegistry] = None, bucket_ratio: float = 2.0):
 
         self.languages = languages
         self.target_lang = target_lang
         self.device = self._determine_device(device)
-        self.translation_models = {}
-        self.context_history = {}
-        self._load_translation_models()
+        # Models are loaded on first use and shared through the process-wide registry
+        self.registry = registry or get_marian_registry()
+        self.model_names = {
+            (src_lang, target_lang): src_info["translation_models"][target_lang]
+            for src_lang, src_info in languages.items()
+            if src_lang != target_lang and target_lang in src_info["translation_models"]
+        }
+        self.context_history = {src_lang: deque(maxlen=3) for src_lang in languages}
         self.last_translation_time = 0
         self.translation_count = 0
         self.total_translation_time = 0
-
+        self.bucket_ratio = bucket_ratio  # translate_batch: longest / shortest text per generate call
 
     def _determine_device(self, device: Optional[str]) -> str:
         """Auto-select the best available device."""
@@ -27,38 +34,12 @@ class Translator:
             return device
         return 'cuda' if torch.cuda.is_available() else 'mps' if torch.backends.mps.is_available() else 'cpu'
     
-    def _load_translation_models(self):
-        """Load only the models needed for this translator's target language."""
-        print(f"Loading translation models for target language: {self.target_lang}")
-        
-        for src_lang, src_info in self.languages.items():
-            if src_lang == self.target_lang:
-                continue  # Skip same language
-                
-            model_name = src_info["translation_models"].get(self.target_lang)
-            if not model_name:
-                continue
-                
-            key = (src_lang, self.target_lang)
-            if key in self.translation_models:
-                continue  # Already loaded
-
-            print(f"Loading {src_info['name']} -> {self.languages[self.target_lang]['name']} model...")
-            try:
-                tokenizer = MarianTokenizer.from_pretrained(model_name)
-                model = MarianMTModel.from_pretrained(model_name).to(self.device)
-
-                self.translation_models[key] = {
-                    "model": model,
-                    "tokenizer": tokenizer
-                }
-
-                if src_lang not in self.context_history:
-                    self.context_history[src_lang] = deque(maxlen=3)
-
-                print(f"{src_lang}->{self.target_lang} loaded on {self.device}")
-            except Exception as e:
-                print(f"Failed to load model {src_lang}->{self.target_lang}: {str(e)}")
+    def _get_model(self, source_lang: str, target_lang: str) -> Optional[Dict]:
+        """Model and tokenizer for a pair from the registry, loading it on first use."""
+        model_name = self.languages.get(source_lang, {}).get("translation_models", {}).get(target_lang)
+        if not model_name:
+            return None
+        return self.registry.get(model_name, self.device)
     
     def is_complete_sentence(self, text: str) -> bool:
         """
@@ -117,8 +98,7 @@ class Translator:
         if source_lang == target_lang:
             return text  # No translation needed
 
-        key = (source_lang, target_lang)
-        model_info = self.translation_models.get(key)
+        model_info = self._get_model(source_lang, target_lang)
         if not model_info:
             print(f"No model for {source_lang}->{target_lang}")
             return ""
@@ -180,7 +160,84 @@ class Translator:
             print(f"Translation error: {str(e)}")
             return ""
 
-    
+    def translate_batch(self, texts: List[str], source_lang: Optional[str],
+                        target_lang: Optional[str] = None) -> List[str]:
+        """Translate several texts of one language pair, batching texts of similar length.
+
+        Texts are sorted by length and split wherever the next text is more
+        than bucket_ratio times the shortest one in its bucket; each bucket is
+        one padded generate call, so short texts are not padded to the length
+        of a long one. Results come back in input order ("" for texts that
+        could not be translated).
+        """
+        target_lang = target_lang or self.target_lang
+        if not texts:
+            return []
+        if source_lang is None:
+            source_lang = getattr(self, "previous_source_lang", None)
+            if source_lang is None:
+                return [""] * len(texts)
+        else:
+            self.previous_source_lang = source_lang
+        if source_lang == target_lang:
+            return list(texts)
+
+        model_info = self._get_model(source_lang, target_lang)
+        if not model_info:
+            print(f"No model for {source_lang}->{target_lang}")
+            return [""] * len(texts)
+
+        start_time = time.time()
+        results = [""] * len(texts)
+        cleaned = [self._preprocess_text(text) if text else "" for text in texts]
+        order = sorted((i for i, text in enumerate(cleaned) if text), key=lambda i: len(cleaned[i]))
+
+        buckets = []
+        for i in order:
+            if buckets and len(cleaned[i]) <= self.bucket_ratio * len(cleaned[buckets[-1][0]]):
+                buckets[-1].append(i)
+            else:
+                buckets.append([i])
+
+        for bucket in buckets:
+            try:
+                inputs = model_info["tokenizer"](
+                    [cleaned[i] for i in bucket],
+                    return_tensors="pt",
+                    padding=True,
+                    truncation=True,
+                    max_length=512
+                )
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+                with torch.no_grad():
+                    outputs = model_info["model"].generate(**inputs, max_length=128, num_beams=4, early_stopping=True)
+                translated_list = model_info["tokenizer"].batch_decode(outputs, skip_special_tokens=True)
+            except Exception as e:
+                print(f"Batch translation error: {str(e)}")
+                continue
+
+            for i, translated in zip(bucket, translated_list):
+                translated = translated.strip()
+                results[i] = "" if translated == "{}" else translated
+                if self.is_complete_sentence(cleaned[i]):
+                    self.context_history[source_lang].append(cleaned[i])
+
+        trans_time = time.time() - start_time
+        self.last_translation_time = trans_time
+        self.translation_count += len(order)
+        self.total_translation_time += trans_time
+        return results
+
+    def warm_up(self, source_lang: str, text: str):
+        """Run one generate call on the source_lang model without touching stats or context."""
+        model_info = self._get_model(source_lang, self.target_lang)
+        if not model_info:
+            return
+        inputs = model_info["tokenizer"]([text], return_tensors="pt", padding=True, truncation=True, max_length=512)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.no_grad():
+            model_info["model"].generate(**inputs, max_length=128, num_beams=4, early_stopping=True)
+
     def get_performance_stats(self) -> Dict:
         """Get translation performance metrics."""
         avg_time = (self.total_translation_time / self.translation_count 
@@ -64,6 +64,11 @@ class KokoroSynthesizer:
         except Exception as e:
             print(f"TTS synthesis error: {str(e)}")
             
+    def warm_up(self, text):
+        """Synthesize text without playback so G2P/espeak and the model are initialized."""
+        for _, _, audio in self.pipeline(text, voice=self.voice):
+            pass
+
     def stop(self):
         """Stop ongoing audio playback and clean resources."""
         try:
@@ -11,11 +11,46 @@ class AudioConfig:
         self.VAD_AGGRESSIVENESS = 2
         self.vad_threshold = 0.5
         self.vad_enabled = True
+        self.INPUT_DEVICE_INDEX = 1  # Microphone used by the Silero recorders
+        # Capture through the PortAudio callback into a lock-free buffer
+        self.CAPTURE_CALLBACK = True
+        self.CAPTURE_BUFFER_SECONDS = 2.0
         # Additional configuration
         self.MIN_AUDIO_CHUNKS = 15
         self.MAX_AUDIO_CHUNKS = 200
         self.SILENCE_THRESHOLD = 1.0  
         self.PROCESSING_DELAY= 2.0
+        # Streaming Silero-VAD (one pass per 512-sample frame instead of a 1.5s window)
+        self.VAD_STREAMING = True
+        self.VAD_BACKEND = "torch"  # "torch" (JIT) or "onnx", loaded from vad_models/
+        self.VAD_NEG_THRESHOLD = 0.35
+        self.VAD_MIN_SPEECH_MS = 96
+        self.VAD_MIN_SILENCE_MS = 600
+        # Cheap-first cascade: webrtcvad/energy gate decides when Silero has to run
+        self.VAD_CASCADE = True
+        self.CASCADE_HANGOVER_MS = 300
+        self.CASCADE_ENERGY_THRESHOLD = 150.0
+        # Early-emit endpointing: push a partial segment on short pauses
+        self.ENDPOINT_EARLY_EMIT = True
+        self.ENDPOINT_PARTIAL_PAUSE_MS = 180
+        self.ENDPOINT_MIN_PARTIAL_MS = 1000
+        # Speech longer than MAX_AUDIO_CHUNKS is split at a quiet point with overlap
+        self.SEGMENT_OVERLAP_MS = 500
+        self.SEGMENT_CUT_SEARCH_MS = 2000
+        # Streaming ASR: re-decode the utterance every interval, commit by local agreement
+        self.STREAMING_ASR = False
+        self.STREAMING_ASR_INTERVAL_MS = 500
+        # Drain up to this many queued segments into one batched Whisper call (1 = off)
+        self.TRANSCRIBE_BATCH_SIZE = 1
+        # Optional front-end before VAD/ASR: DC removal, high-pass, noise gate, AGC
+        self.FRONTEND_ENABLED = False
+        self.FRONTEND_HIGHPASS_HZ = 100
+        self.FRONTEND_HIGHPASS_TAPS = 511
+        self.FRONTEND_NOISE_FLOOR = 100.0
+        self.FRONTEND_GATE_RATIO = 2.0
+        self.FRONTEND_GATE_ATTENUATION = 0.1
+        self.FRONTEND_AGC_TARGET_RMS = 3000.0
+        self.FRONTEND_AGC_MAX_GAIN = 8.0
 
 class Languages:
     """Language configuration."""
@@ -52,4 +87,77 @@ class Languages:
     
     def get_languages(self):
         """Return the language configuration."""
-        return self.languages
\ No newline at end of file
+        return self.languages
+
+class WhisperConfig:
+    """Named Whisper decoding profiles."""
+    def __init__(self):
+        self.PROFILE = "accurate"  # Default profile for a pipeline
+        # Multi-process transcription: worker processes (0 = transcribe in-process)
+        self.POOL_WORKERS = 0
+        self.POOL_CPU_THREADS = 2  # CTranslate2 threads per worker
+        # Sticky source language: lock it after a few confident detections
+        self.STICKY_LANGUAGE = True
+        self.STICKY_STABLE_SEGMENTS = 3
+        self.STICKY_MIN_PROBABILITY = 0.8
+        self.STICKY_MIN_LOGPROB = -0.8  # Re-detect when a locked decode scores below this
+        self.STICKY_RECHECK_EVERY = 10
+        # Faster model per locked source language; others use the profile's multilingual model.
+        # Only bundled models can be routed to: e.g. {"en": "base.en"} after
+        # `python -m stt.whisper_registry --fetch base.en`. Unbundled routes are dropped at startup.
+        self.LANGUAGE_ROUTES = {}
+        # Source language decision: trust Whisper above this probability, otherwise fuse it
+        # with the text detector and a session prior (text scores of short utterances are cached)
+        self.FUSION_WHISPER_CONFIDENT = 0.9
+        self.FUSION_CACHE_SIZE = 256
+        self.FUSION_CACHE_MAX_CHARS = 40
+        self.FUSION_PRIOR_DECAY = 0.8
+        # Confidence gate before translation/TTS (drop junk, hold low-confidence text)
+        self.GATE_ENABLED = True
+        self.GATE_NO_SPEECH_PROB = 0.6
+        self.GATE_DROP_LOGPROB = -1.0
+        self.GATE_HOLD_LOGPROB = -0.8
+        self.GATE_MAX_COMPRESSION = 2.4
+        # compute_type None picks float16 on CUDA and int8 on CPU
+        self.profiles = {
+            "realtime": {
+                "model": "small",  # The only bundled model; speed comes from greedy decoding
+                "compute_type": None,
+                "beam_size": 1,
+                "best_of": 1,
+                "patience": 1.0,
+                "temperature": [0.0],  # Greedy, no fallback re-decodes
+                "condition_on_previous_text": False
+            },
+            "balanced": {
+                "model": "small",
+                "compute_type": None,
+                "beam_size": 2,
+                "best_of": 2,
+                "patience": 1.0,
+                "temperature": [0.0, 0.4, 0.8],
+                "condition_on_previous_text": False
+            },
+            "accurate": {
+                "model": "small",
+                "compute_type": None,
+                "beam_size": 5,
+                "best_of": 5,
+                "patience": 0.1,
+                "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],  # Whisper's fallback ladder
+                "condition_on_previous_text": True
+            }
+        }
+
+class TranslationConfig:
+    """MarianMT model registry and batching settings."""
+    def __init__(self):
+        # Loaded MarianMT models share this budget; least recently used pairs are
+        # unloaded above it (an opus-mt pair is ~300 MB in float32). None = no limit.
+        self.MARIAN_MEMORY_BUDGET_MB = 1000
+        # Micro-batching: requests for one language pair wait up to BATCH_WINDOW_MS
+        # for others to share a single generate call, at most BATCH_MAX_ITEMS per call
+        self.BATCH_WINDOW_MS = 5
+        self.BATCH_MAX_ITEMS = 8
+        # How long a caller waits for one translation; covers a cold Marian load after a target switch
+        self.RESULT_TIMEOUT_S = 60
@@ -0,0 +1,81 @@
+import threading
+import time
+
+# Short sentences per language for first-call warmup of translation and TTS
+WARMUP_TEXT = {
+    "en": "Hello, how are you today?",
+    "es": "Hola, ¿cómo estás hoy?",
+    "fr": "Bonjour, comment allez-vous aujourd'hui ?"
+}
+
+
+class ModelWarmup:
+    """Runs each registered warmup call twice in a background thread.
+
+    The first call pays lazy allocation, kernel selection and G2P set-up
+    (cold); the second shows steady-state latency (warm). `ready` is set
+    once every model has been through both.
+    """
+
+    def __init__(self, on_ready=None):
+        self.tasks = []  # (name, callable)
+        self.results = {}  # name -> {"cold_ms", "warm_ms"} or {"error"}
+        self.ready = threading.Event()
+        self.on_ready = on_ready
+        self.thread = None
+        self.total_ms = None
+
+    def add(self, name, fn):
+        self.tasks.append((name, fn))
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="ModelWarmup", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        for name, fn in self.tasks:
+            try:
+                timings = []
+                for _ in range(2):
+                    call_start = time.perf_counter()
+                    fn()
+                    timings.append((time.perf_counter() - call_start) * 1000)
+                self.results[name] = {"cold_ms": round(timings[0]), "warm_ms": round(timings[1])}
+            except Exception as e:
+                self.results[name] = {"error": str(e)}
+        self.total_ms = round((time.perf_counter() - start) * 1000)
+        self.print_report()
+        self.ready.set()
+        if self.on_ready:
+            self.on_ready()
+
+    def print_report(self):
+        print(f"\n🔥 Warmup finished in {self.total_ms} ms (cold → warm per model):")
+        for name, result in self.results.items():
+            if "error" in result:
+                print(f"  {name}: failed ({result['error']})")
+            else:
+                print(f"  {name}: {result['cold_ms']} ms → {result['warm_ms']} ms")
+
+    def get_stats(self):
+        return {"ready": self.ready.is_set(), "models": dict(self.results)}
+
+
+def pipeline_warmup(transcriber, translators, synthesizers, on_ready=None):
+    """Warmup for Whisper, the Marian models of the given translators ({target: Translator}) and every Kokoro pipeline.
+
+    Marian models load on first use, so pass only the translators whose
+    models should be resident (the active target) to keep the rest unloaded.
+    """
+    warmup = ModelWarmup(on_ready)
+    if transcriber:  # None when a worker pool transcribes; its workers warm up on their own
+        warmup.add("whisper", transcriber.warm_up)
+    for target_lang, translator in translators.items():
+        for source_lang, _ in translator.model_names:
+            warmup.add(f"marian {source_lang}->{target_lang}",
+                       lambda t=translator, s=source_lang: t.warm_up(s, WARMUP_TEXT.get(s, WARMUP_TEXT["en"])))
+    for lang_code, synthesizer in synthesizers.items():
+        warmup.add(f"kokoro {lang_code}",
+                   lambda s=synthesizer, l=lang_code: s.warm_up(WARMUP_TEXT.get(l, WARMUP_TEXT["en"])))
+    return warmup